@@ -3,6 +3,7 @@ PIF RAG Chat - Streamlit Application
 Clean, modular interface using src.ui package
 """
 
+import uuid
 import streamlit as st
 from src.ui.styles import apply_custom_css
 from src.ui.components import (
@@ -10,6 +11,7 @@ from src.ui.components import (
     render_landing_page,
     render_chat_interface
 )
+from src.retrieval.prefetch import AnswerPrefetcher
 from src.ui.utils import (
     extract_name_from_input,
     validate_question_input,
@@ -37,10 +39,12 @@ if 'debug_mode' not in st.session_state:
     st.session_state.debug_mode = False
 if 'show_chat' not in st.session_state:
     st.session_state.show_chat = False
-if 'last_streamed_idx' not in st.session_state:
-    st.session_state.last_streamed_idx = -1
 if 'show_tips' not in st.session_state:
     st.session_state.show_tips = False
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+if 'prefetcher' not in st.session_state:
+    st.session_state.prefetcher = AnswerPrefetcher(session_id=st.session_state.session_id)
 
 def main():
     """Main application entry point"""
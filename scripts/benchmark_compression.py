@@ -0,0 +1,72 @@
+"""
+Context compression benchmark - compares prompt size and time-to-answer
+with and without query-focused compression
+Requires Qdrant, Ollama and the LLM proxy to be running
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import time
+import logging
+from src.core.text_utils import estimate_tokens
+from src.llm.llm_proxy import get_llm_proxy
+from src.retrieval.rag_query import is_arabic, search_multiple_collections
+from src.retrieval.context_compressor import compress_context
+from src.retrieval.context_packer import pack_context, context_budget
+
+QUESTIONS = [
+    "How many jobs did PIF create in 2022?",
+    "What is PIF's assets under management in 2023?",
+    "What are PIF's investments in NEOM?",
+    "ما هي استثمارات الصندوق في قطاع السياحة؟",
+]
+
+def time_answer(question, chunks, arabic):
+    """Generate an answer from the packed chunks and return (prompt tokens, seconds)"""
+    packed = pack_context(chunks, context_budget())
+    context = "\n\n".join(chunk['text'] for chunk in packed)
+    start = time.perf_counter()
+    get_llm_proxy().generate_answer(question=question, context=context, is_arabic=arabic)
+    return estimate_tokens(context), time.perf_counter() - start
+
+def main():
+    logging.basicConfig(level=logging.WARNING)
+
+    print("="*70)
+    print("📉 Context Compression Benchmark")
+    print("="*70 + "\n")
+
+    totals = {'full': [0, 0.0], 'compressed': [0, 0.0]}
+    for question in QUESTIONS:
+        arabic = is_arabic(question)
+        chunks = search_multiple_collections(question, arabic)
+        if not chunks:
+            print(f"⚠️  No results: {question}")
+            continue
+
+        full_tokens, full_time = time_answer(question, chunks, arabic)
+        small_tokens, small_time = time_answer(question, compress_context(question, chunks), arabic)
+        totals['full'][0] += full_tokens
+        totals['full'][1] += full_time
+        totals['compressed'][0] += small_tokens
+        totals['compressed'][1] += small_time
+
+        print(f"❓ {question}")
+        print(f"   Full:       {full_tokens:5d} tokens  {full_time:6.2f}s")
+        print(f"   Compressed: {small_tokens:5d} tokens  {small_time:6.2f}s\n")
+
+    full_tokens, full_time = totals['full']
+    small_tokens, small_time = totals['compressed']
+    if full_tokens:
+        print("="*70)
+        print(f"📊 Input tokens: {full_tokens} -> {small_tokens} ({1 - small_tokens / full_tokens:.0%} reduction)")
+        print(f"⏱️  Time-to-answer: {full_time:.2f}s -> {small_time:.2f}s ({full_time - small_time:+.2f}s saved)")
+        print("="*70)
+
+if __name__ == "__main__":
+    main()
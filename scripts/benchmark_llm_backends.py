@@ -0,0 +1,79 @@
+"""
+LLM backend benchmark - compares per-call overhead of the litellm proxy server
+(localhost HTTP) and the in-process LiteLLM Router
+Calls use LiteLLM's mock_response, so no provider is contacted and only the
+client/proxy/router overhead is measured. Starts the proxy if it is not running.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import time
+import statistics
+import logging
+from src.llm.llm_proxy import LLMProxyManager
+
+CALLS = 50
+MESSAGES = [
+    {"role": "system", "content": "You answer questions about PIF annual reports."},
+    {"role": "user", "content": "What is PIF's assets under management in 2023?"},
+]
+
+def time_calls(manager, calls=CALLS):
+    """Per-call latencies (ms) of mocked completions through the manager's client"""
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        manager.client.chat.completions.create(
+            model="rag-llm",
+            messages=MESSAGES,
+            max_tokens=16,
+            extra_body={"mock_response": "PIF's assets under management were SAR 2.87 trillion."}
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def report(label, startup, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(f"{label:8s} startup {startup:7.2f}s   mean {statistics.mean(latencies):7.2f} ms   "
+          f"p50 {statistics.median(latencies):7.2f} ms   p95 {p95:7.2f} ms")
+
+def main():
+    logging.basicConfig(level=logging.WARNING)
+
+    print("="*70)
+    print("⚡ LLM Backend Overhead Benchmark (proxy vs in-process router)")
+    print("="*70 + "\n")
+
+    config_path = project_root / "config" / "llm_proxy_config.yaml"
+    results = {}
+    for backend in ("proxy", "router"):
+        manager = LLMProxyManager(config_path=str(config_path), backend=backend)
+        start = time.perf_counter()
+        if not manager.start_proxy():
+            print(f"❌ Could not start {backend} backend, skipping")
+            continue
+        startup = time.perf_counter() - start
+
+        time_calls(manager, calls=3)  # Warm up connections and lazy imports
+        results[backend] = (startup, time_calls(manager))
+        if backend == "proxy" and manager.proxy_process:
+            manager.stop_proxy()
+
+    for backend, (startup, latencies) in results.items():
+        report(backend, startup, latencies)
+
+    if len(results) == 2:
+        saved = statistics.mean(results["proxy"][1]) - statistics.mean(results["router"][1])
+        print("\n" + "="*70)
+        print(f"📊 Router saves {saved:.2f} ms per call "
+              f"and {results['proxy'][0] - results['router'][0]:.2f}s of startup")
+        print("="*70)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Text normalization microbenchmark - compares a naive regex-chain normalizer
+with the shared translate-based normalize_text
+No services required
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import re
+import time
+from src.core.normalization import normalize_text
+
+SAMPLES = [
+    "ما هي استثمارات صندوق الاستثمارات العامة في عام ٢٠٢٣؟",
+    "ما هى إستثمارات الصندوق فى قطاع السياحة",
+    "كَمْ عَدَدُ الوظائف التي أنشأها الصندوق؟",
+    "الأصـــول المدارة للصندوق",
+    "How many jobs did PIF create in 2022?",
+    "What is PIF's  ASSETS under management   in 2023?",
+    "Tell me about NEOM and the giga-projects",
+]
+
+# Naive reference: one regex pass per rule, as ad-hoc normalizers usually do
+_NAIVE_RULES = [
+    (re.compile(r'[ً-ٰٟ]'), ''),
+    (re.compile(r'ـ'), ''),
+    (re.compile(r'[آأإٱ]'), 'ا'),
+    (re.compile(r'ى'), 'ي'),
+    (re.compile(r'ة'), 'ه'),
+]
+_NAIVE_DIGITS = {c: str(i) for i, c in enumerate("٠١٢٣٤٥٦٧٨٩")}
+
+
+def naive_normalize(text):
+    for pattern, replacement in _NAIVE_RULES:
+        text = pattern.sub(replacement, text)
+    text = ''.join(_NAIVE_DIGITS.get(c, c) for c in text)
+    return ' '.join(text.lower().split())
+
+
+def bench(label, func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = time.perf_counter() - start
+    per_text = elapsed / (repeat * len(texts)) * 1e6
+    print(f"   {label:<28} {elapsed * 1000:8.1f} ms total   {per_text:6.2f} µs/text")
+    return elapsed
+
+
+def main():
+    global texts
+    texts = SAMPLES * 200
+    repeat = 20
+
+    print("="*70)
+    print("🔤 Text Normalization Microbenchmark")
+    print("="*70)
+    print(f"\n📝 {len(texts)} texts x {repeat} runs\n")
+
+    naive = bench("naive (regex chain)", lambda: [naive_normalize(t) for t in texts], repeat)
+    single = bench("normalize_text (per text)", lambda: [normalize_text(t) for t in texts], repeat)
+
+    print(f"\n⚡ Speedup vs naive: {naive / single:.1f}x")
+
+    print("\n🔑 Spelling variants that now share one key:")
+    for variants in [
+        ("إستثمارات الصندوق", "استثمارات الصندوق", "اِسْتِثْمَارات الصندوق"),
+        ("الأصـــول المدارة ٢٠٢٣", "الاصول المدارة 2023"),
+        ("PIF  Jobs", "pif jobs"),
+    ]:
+        keys = {normalize_text(v) for v in variants}
+        status = "✅" if len(keys) == 1 else "❌"
+        print(f"   {status} {' | '.join(variants)}  ->  {next(iter(keys))}")
+
+    print("\n" + "="*70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Rebuild the structured table index from already extracted table CSVs
+(no PDF extraction or embedding needed)
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import logging
+from src.core.config import year_to_filename_ar, year_to_filename_en, TABLE_INDEX_PATH
+from src.core.table_index import index_report_tables
+
+def main():
+    logging.basicConfig(level=logging.WARNING)
+
+    print("="*70)
+    print("📊 PIF Annual Reports - Table Index Builder")
+    print("="*70)
+    print(f"\n💾 Index: {TABLE_INDEX_PATH}\n")
+
+    configs = [
+        (year_to_filename_ar, "output_ar_{}", "ar"),
+        (year_to_filename_en, "output_en_{}", "en")
+    ]
+
+    total_cells = 0
+    for mapping, output_fmt, language in configs:
+        for year, doc_filename in mapping.items():
+            output_dir = project_root / "data" / "outputs" / output_fmt.format(year)
+            if not output_dir.exists():
+                print(f"⚠️  [{year}] No extraction output for {doc_filename} (run process_documents.py)")
+                continue
+            cells = index_report_tables(output_dir, doc_filename, year=year, language=language)
+            total_cells += cells
+            print(f"✅ [{year}] {doc_filename}: {cells} numeric cells")
+
+    print("\n" + "="*70)
+    print(f"📊 Indexed {total_cells} numeric cells")
+    print("="*70 + "\n")
+
+if __name__ == "__main__":
+    main()
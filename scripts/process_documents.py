@@ -15,11 +15,18 @@ import requests
 from docling.chunking import HybridChunker
 from docling_core.transforms.chunker.tokenizer.huggingface import HuggingFaceTokenizer
 from transformers import AutoTokenizer
-from src.core.config import MAX_TOKENS, EMBED_BATCH_SIZE, year_to_filename_ar, year_to_filename_en, EMBED_DIMENSION
+from src.core.config import (
+    MAX_TOKENS, EMBED_BATCH_SIZE, year_to_filename_ar, year_to_filename_en, EMBED_DIMENSION,
+    PARENT_CHILD_INDEXING, CHILD_CHUNK_TOKENS, BUILD_SUMMARIES, TABLE_INDEX_ENABLED
+)
 from src.core.extraction import extract_from_pdf
-from src.core.chunking import chunk_document
+from src.core.chunking import chunk_document, split_into_children
 from src.core.embedding import embed
-from src.core.qdrant_utils import create_qdrant_collection, upload_points, verify_collection_data
+from src.core.summarization import build_report_summaries
+from src.core.table_index import index_report_tables
+from src.core.qdrant_utils import (
+    create_qdrant_collection, upload_points, verify_collection_data, create_parent_store, upload_parents
+)
 
 def check_services():
     """Check if required services are running"""
@@ -56,9 +63,16 @@ def check_services():
     print()
     return services_ok
 
-def process_report(input_pdf_path, output_dir, is_arabic):
+def process_report(input_pdf_path, output_dir, is_arabic, year=None):
     doc, doc_filename = extract_from_pdf(input_pdf_path, output_dir)
     
+    # Exported table CSVs -> structured table index (KPI lookups)
+    if TABLE_INDEX_ENABLED:
+        try:
+            index_report_tables(output_dir, doc_filename, year=year, language="ar" if is_arabic else "en")
+        except Exception as e:
+            logging.warning(f"Table indexing failed for {doc_filename}: {e}")
+    
     # Create HuggingFace tokenizer instance first
     try:
         hf_tokenizer = AutoTokenizer.from_pretrained("bert-base-uncased")
@@ -75,16 +89,40 @@ def process_report(input_pdf_path, output_dir, is_arabic):
         enriched_text = chunker.contextualize(chunk=chunk).strip()
         if len(enriched_text) < 100:
             continue
+        headings = getattr(chunk.meta, "headings", None)
         all_chunks.append({
             "index": i,
+            "section": headings[0] if headings else None,
             "text": enriched_text,
-            "chunk_id": f"{doc_filename}_chunk_{i:03}"
+            "chunk_id": f"{doc_filename}_chunk_{i:03}",
+            "token_count": tokenizer.count_tokens(enriched_text)
         })
     
     if not all_chunks:
         logging.warning(f"No valid chunks found for {input_pdf_path}")
         return
     
+    if BUILD_SUMMARIES:
+        build_summary_index(all_chunks, doc_filename)
+    
+    # Small-to-big: store the chunks as parent sections, embed small child passages
+    if PARENT_CHILD_INDEXING:
+        parents = [{**chunk, "id": chunk["index"]} for chunk in all_chunks]
+        parent_store = f"{doc_filename}_parents"
+        upload_parents(create_parent_store(parent_store), parent_store, parents)
+        
+        child_chunks = []
+        for parent in parents:
+            for j, child_text in enumerate(split_into_children(parent["text"], CHILD_CHUNK_TOKENS, tokenizer.count_tokens), 1):
+                child_chunks.append({
+                    "text": child_text,
+                    "chunk_id": f"{parent['chunk_id']}_{j:02}",
+                    "token_count": tokenizer.count_tokens(child_text),
+                    "parent_id": parent["id"]
+                })
+        logging.info(f"Split {len(parents)} sections into {len(child_chunks)} child passages")
+        all_chunks = child_chunks
+    
     # Use Ollama embeddings (no need to pass model/tokenizer)
     texts = [chunk["text"] for chunk in all_chunks]
     vectors = embed(texts, batch_size=EMBED_BATCH_SIZE)
@@ -101,6 +139,28 @@ def process_report(input_pdf_path, output_dir, is_arabic):
     else:
         logging.warning(f"⚠️  Data verification issues for {input_pdf_path}")
 
+def build_summary_index(chunks, doc_filename):
+    """Summarize each section and the whole report, and index the summaries in '<doc>_summaries'"""
+    summarizer = None
+    try:
+        from src.llm.llm_proxy import get_llm_proxy
+        llm_proxy = get_llm_proxy()
+        if llm_proxy.client:
+            summarizer = llm_proxy.summarize
+    except Exception as e:
+        logging.warning(f"LLM proxy unavailable for summaries: {e}")
+    if summarizer is None:
+        logging.info("Building extractive summaries (LLM proxy not running)")
+    
+    summaries = build_report_summaries(chunks, summarizer)
+    if not summaries:
+        return
+    
+    vectors = embed([s["text"] for s in summaries], batch_size=EMBED_BATCH_SIZE)
+    collection_name = f"{doc_filename}_summaries"
+    qdrant = create_qdrant_collection(collection_name, EMBED_DIMENSION)
+    upload_points(qdrant, collection_name, vectors, summaries)
+
 def find_pdf_file(doc_filename, project_root):
     """
     Search for PDF file in multiple locations:
@@ -184,7 +244,7 @@ def main():
             
             try:
                 print(f"   🔄 Processing...")
-                process_report(pdf_file, output_dir, is_arabic)
+                process_report(pdf_file, output_dir, is_arabic, year=year)
                 processed_files += 1
                 print(f"   ✅ Successfully processed!\n")
             except Exception as e:
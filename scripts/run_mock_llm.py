@@ -0,0 +1,59 @@
+"""
+Run the local mock LLM server in place of the LiteLLM proxy
+The app, benchmarks and scripts then work offline (default port is the proxy's)
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+import time
+import logging
+from src.core.config import LLM_PROXY_PORT
+from src.llm.mock_server import MockBehavior, MockLLMServer
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI-compatible mock LLM server")
+    parser.add_argument("--port", type=int, default=LLM_PROXY_PORT)
+    parser.add_argument("--latency", choices=["fixed", "uniform", "normal", "lognormal"], default="fixed")
+    parser.add_argument("--latency-mean", type=float, default=0.05, help="Seconds before the first token")
+    parser.add_argument("--latency-spread", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Streaming token rate (0 = instant)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of HTTP 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of HTTP 429 responses")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    behavior = MockBehavior(
+        latency=args.latency,
+        latency_mean=args.latency_mean,
+        latency_spread=args.latency_spread,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate
+    )
+    server = MockLLMServer(behavior, port=args.port, seed=args.seed).start()
+
+    print("="*70)
+    print(f"🧪 Mock LLM server on {server.base_url}")
+    print(f"   Latency: {args.latency} {args.latency_mean}s ± {args.latency_spread}")
+    print(f"   Errors: {args.error_rate:.0%} 500s, {args.rate_limit_rate:.0%} 429s")
+    print("Press Ctrl+C to stop")
+    print("="*70 + "\n")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print(f"\n📊 Requests: {server.stats.requests}  Statuses: {server.stats.statuses}")
+        server.stop()
+        print("✅ Mock server stopped")
+
+if __name__ == "__main__":
+    main()
@@ -4,25 +4,48 @@ Core RAG functionality: extraction, chunking, embedding, and vector storage
 
 from .config import *
 from .extraction import extract_from_pdf
-from .chunking import clean_markdown, chunk_document
-from .embedding import embed, embed_query
+from .chunking import clean_markdown, chunk_document, split_into_children
+from .embedding import embed, embed_query, embed_queries
+from .deadline import Deadline, DeadlineExceeded
+from .summarization import build_report_summaries, extractive_summary
+from .normalization import normalize_text, normalize_digits, text_fingerprint
+from .table_index import index_report_tables, query_table_rows, parse_number, format_value
 from .qdrant_utils import (
     test_qdrant_connection,
     create_qdrant_collection,
     upload_points,
     verify_collection_data,
-    search_collection
+    search_collection,
+    create_parent_store,
+    upload_parents,
+    fetch_parents
 )
 
 __all__ = [
     'extract_from_pdf',
     'clean_markdown',
     'chunk_document',
+    'split_into_children',
     'embed',
     'embed_query',
+    'embed_queries',
+    'Deadline',
+    'DeadlineExceeded',
+    'build_report_summaries',
+    'extractive_summary',
+    'normalize_text',
+    'normalize_digits',
+    'text_fingerprint',
+    'index_report_tables',
+    'query_table_rows',
+    'parse_number',
+    'format_value',
     'test_qdrant_connection',
     'create_qdrant_collection',
     'upload_points',
     'verify_collection_data',
     'search_collection',
+    'create_parent_store',
+    'upload_parents',
+    'fetch_parents',
 ]
@@ -1,6 +1,8 @@
 import re
+from typing import Callable, List
 from docling_core.transforms.chunker.tokenizer.huggingface import HuggingFaceTokenizer
 from docling.chunking import HybridChunker
+from .text_utils import split_sentences
 
 # Helper: filter lines in Markdown that are too short or meaningless
 def is_valid_line(line: str) -> bool:
@@ -24,4 +26,18 @@ def clean_markdown(md: str) -> str:
 # Placeholder for chunking logic using HuggingFaceTokenizer and HybridChunker
 def chunk_document(doc, tokenizer, max_tokens=8192, merge_peers=True):
     chunker = HybridChunker(tokenizer=tokenizer, merge_peers=merge_peers)
-    return list(chunker.chunk(dl_doc=doc))
\ No newline at end of file
+    return list(chunker.chunk(dl_doc=doc))
+
+# Split a parent chunk into small child passages (sentence-aligned) for precise vector search
+def split_into_children(text: str, max_tokens: int, count_tokens: Callable[[str], int]) -> List[str]:
+    children, current, current_tokens = [], [], 0
+    for sentence in split_sentences(text):
+        tokens = count_tokens(sentence)
+        if current and current_tokens + tokens > max_tokens:
+            children.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(sentence)
+        current_tokens += tokens
+    if current:
+        children.append(" ".join(current))
+    return children
\ No newline at end of file
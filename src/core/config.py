@@ -26,6 +26,32 @@ EMBED_DIMENSION = 4096  # qwen3-embedding dimension
 MAX_TOKENS = 8192
 EMBED_BATCH_SIZE = 8
 
+# Parent-child (small-to-big) indexing: embed small child passages, answer from their parent sections
+PARENT_CHILD_INDEXING = True
+CHILD_CHUNK_TOKENS = 256
+PARENT_EXPANSION_BUDGET = 2400  # Max tokens of parent text added per query (see PROMPT_TOKEN_BUDGET)
+
+# Multi-year comparisons: context chunks retrieved per compared year
+COMPARISON_CHUNKS_PER_YEAR = 2
+
+# Hierarchical summaries ('<doc>_summaries' collections) for broad questions
+BUILD_SUMMARIES = True
+SUMMARY_CONTEXT_LIMIT = 4  # Summary passages used to answer a broad question
+
+# Structured table index (report tables in SQLite) for KPI lookups
+TABLE_INDEX_ENABLED = True
+TABLE_INDEX_PATH = str(Path(__file__).parent.parent.parent / "data" / "table_index.db")
+TABLE_CONTEXT_ROWS = 12  # Max exact table rows added to the context of a KPI question
+
+# Fast-path intent classification (chitchat / out-of-scope messages skip retrieval and the LLM)
+INTENT_FAST_PATH = True
+INTENT_CENTROID_ENABLED = True  # Nearest-centroid check on the query embedding when rules are inconclusive
+INTENT_CENTROID_MARGIN = 0.05  # Similarity lead over the corpus centroid needed to skip the pipeline
+
+# Request deadlines (fail fast instead of hanging the UI)
+RAG_REQUEST_TIMEOUT = 45  # Seconds for one RAG call: embedding + search + LLM
+EMBED_ATTEMPT_TIMEOUT = 10  # Max seconds per query embedding attempt
+
 # Example input/output mapping for main script
 year_to_filename_ar = {
     "2021": "PIF Annual Report 2021-ar",
@@ -38,11 +64,82 @@ year_to_filename_en = {
     "2023": "PIF-2023-Annual-Report-EN"
 }
 
+# Cross-lingual retrieval: search Arabic and English collections for every question
+BILINGUAL_SEARCH = False
+# Linear score calibration per collection language (score * scale + bias), applied
+# before merging; tune from evaluation runs so neither language dominates unfairly
+LANGUAGE_SCORE_CALIBRATION = {
+    "ar": {"scale": 1.0, "bias": 0.0},
+    "en": {"scale": 1.0, "bias": 0.0},
+}
+
 # LLM Proxy Configuration
 LLM_PROXY_PORT = 4000
 LLM_PROXY_CONFIG = "llm_proxy_config.yaml"
 LLM_MAX_TOKENS = 500
 LLM_TEMPERATURE = 0.3
+LLM_BACKEND = "proxy"  # "proxy" (litellm server on LLM_PROXY_PORT) or "router" (in-process LiteLLM Router)
+
+# LLM proxy health: background liveness polling + circuit breaker on call failures
+HEALTH_CHECK_INTERVAL = 5  # Seconds between background health checks
+HEALTH_CHECK_TIMEOUT = 2
+CIRCUIT_FAILURE_THRESHOLD = 3  # Consecutive failures that open the circuit
+CIRCUIT_RESET_TIMEOUT = 15  # Seconds before a half-open probe call is allowed
+
+# Proxy process supervision (proxy started by the app): drained, rotated logs + auto-restart
+PROXY_LOG_PATH = str(Path(__file__).parent.parent.parent / "logs" / "llm_proxy.log")
+PROXY_LOG_MAX_BYTES = 5 * 1024 * 1024
+PROXY_LOG_BACKUPS = 3
+PROXY_SUPERVISE_INTERVAL = 5  # Seconds between supervisor checks
+PROXY_UNHEALTHY_GRACE = 30  # Seconds of failed liveness probes before the proxy is restarted
+PROXY_RESTART_BACKOFF = 2  # First restart delay; doubles for each consecutive restart
+PROXY_MAX_BACKOFF = 60
+PROXY_STABLE_UPTIME = 120  # Uptime after which the back-off resets
+
+# Async generation: global cap on in-flight completions + single-flight coalescing
+LLM_MAX_CONCURRENT_REQUESTS = 8  # Completions in flight at once across all sessions
+LLM_COALESCE_REQUESTS = True  # Identical concurrent requests share one completion
+
+# Hedged requests across the proxy's fallback models (async path)
+HEDGE_ENABLED = True
+HEDGE_MIN_SAMPLES = 5  # Latency samples before a model's p95 is trusted
+HEDGE_DEFAULT_DELAY = 8.0  # Seconds before hedging while a model's p95 is unknown
+HEDGE_MIN_DELAY = 1.0  # Never hedge sooner than this
+LATENCY_EWMA_ALPHA = 0.2
+LATENCY_WINDOW = 100  # Recent latency samples kept per model
+
+# Client-side rate limiting from the rpm/tpm declared in llm_proxy_config.yaml
+RATE_LIMIT_ENABLED = True
+RATE_LIMIT_MAX_WAIT = 5  # Seconds a request may queue for capacity before falling back
+
+# Complexity routing: model tier + output cap per question (tiers in llm_proxy_config.yaml)
+COMPLEXITY_ROUTING_ENABLED = True
+
+# Context packing: token budget for retrieved context + chat history in one prompt
+PROMPT_TOKEN_BUDGET = 3000
+HISTORY_TOKEN_RESERVE = 800  # Max tokens of the budget reserved for chat history
+MIN_CHUNK_TOKENS = 64  # Smallest truncated passage worth sending
+
+# Query-focused context compression (runs before packing)
+COMPRESSION_ENABLED = True
+COMPRESSION_SCORER = "lexical"  # "lexical" (no extra calls) or "embedding" (cached sentence vectors)
+COMPRESSION_TOP_SENTENCES = 12  # Most relevant sentences kept across all chunks
+COMPRESSION_NEIGHBORS = 1  # Sentences kept on each side of a selected sentence
+SENTENCE_CACHE_SIZE = 5000
+
+# Chat history in prompts (budget is HISTORY_TOKEN_RESERVE)
+HISTORY_RECENT_MESSAGES = 8  # Newest messages kept verbatim when they fit
+HISTORY_SUMMARY_TOKENS = 250  # Rolling summary of older turns
+HISTORY_SUMMARY_CACHE_SIZE = 256  # Chat sessions whose rolling summary is kept
+
+# Batch RAG API (offline evaluation / pre-warming)
+BATCH_MAX_CONCURRENCY = 4  # Batch questions answered in parallel; LLM calls are held to rpm/tpm by the rate limiter
+
+# Follow-up answer prefetching (speculative, per Streamlit session)
+PREFETCH_MAX_WORKERS = 2  # Shared thread pool across all sessions
+PREFETCH_SESSION_BUDGET = 20  # Max prefetched answers per session
+PREFETCH_WAIT_TIMEOUT = 5  # Seconds to wait for a prefetch that is still running (then answer normally)
+PREFETCH_MIN_HEADROOM = 0.5  # Skip a prefetch unless this share of an LLM model's rpm/tpm bucket is free
 
 # Ollama Cloud Configuration (Free Tier)
 OLLAMA_CLOUD_BASE = "https://cloud.ollama.ai"
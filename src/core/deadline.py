@@ -0,0 +1,59 @@
+"""
+Request-scoped deadlines shared by embedding, search and generation
+"""
+
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Optional
+import time
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request has run out of time budget"""
+
+
+class Deadline:
+    """Absolute point in time by which a request must finish"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self._expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left (never negative)"""
+        return max(self._expires_at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, cap: Optional[float] = None) -> float:
+        """Timeout for one operation: the remaining budget, optionally capped"""
+        remaining = self.remaining()
+        return min(remaining, cap) if cap is not None else remaining
+
+    def cancel(self):
+        """Expire now: work sharing this deadline stops at its next check"""
+        self._expires_at = time.monotonic()
+
+    def check(self, operation: str = "request"):
+        """Raise DeadlineExceeded if no budget is left"""
+        if self.expired():
+            raise DeadlineExceeded(f"Deadline of {self.seconds:.0f}s exceeded before {operation}")
+
+
+# Worker threads for blocking client calls that have no per-call timeout
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="deadline")
+
+
+def call_with_timeout(func: Callable, timeout: float, *args, **kwargs):
+    """
+    Run a blocking call, giving up after `timeout` seconds
+
+    The abandoned call keeps running in its worker until the client's own
+    timeout fires; the caller gets DeadlineExceeded immediately.
+    """
+    future = _executor.submit(func, *args, **kwargs)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise DeadlineExceeded(f"Call did not finish within {timeout:.1f}s")
@@ -1,8 +1,9 @@
 import numpy as np
 import ollama
-from typing import List, Union
+from typing import List, Optional, Union
 import logging
-from .config import EMBEDDING_PROVIDER, EMBED_MODEL_ID, OLLAMA_BASE_URL, EMBED_DIMENSION
+from .config import EMBEDDING_PROVIDER, EMBED_MODEL_ID, OLLAMA_BASE_URL, EMBED_DIMENSION, EMBED_ATTEMPT_TIMEOUT
+from .deadline import Deadline, DeadlineExceeded, call_with_timeout
 import time
 
 logger = logging.getLogger(__name__)
@@ -58,22 +59,15 @@ def embed(texts: Union[str, List[str]], model=None, tokenizer=None, batch_size=4
         batch = texts[i:i + batch_size]
         
         try:
-            for text in batch:
-                # Call Ollama embedding API
-                response = client.embeddings(
-                    model=EMBED_MODEL_ID,
-                    prompt=text,
-                    options={
-                        "num_thread": 4,  # Limit CPU threads to save resources
-                    }
-                )
-                
-                # Extract embedding from response
-                if 'embedding' in response:
-                    embeddings.append(response['embedding'])
-                else:
-                    logger.warning(f"No embedding in response for text: {text[:50]}...")
-                    embeddings.append([0.0] * EMBED_DIMENSION)
+            # Call Ollama embedding API (one request per batch)
+            response = client.embed(
+                model=EMBED_MODEL_ID,
+                input=batch,
+                options={
+                    "num_thread": 4,  # Limit CPU threads to save resources
+                }
+            )
+            embeddings.extend(response['embeddings'])
                     
         except Exception as e:
             logger.error(f"Error embedding batch {i//batch_size + 1}: {e}")
@@ -95,24 +89,41 @@ def embed(texts: Union[str, List[str]], model=None, tokenizer=None, batch_size=4
     
     return embeddings
 
-def embed_query(text: str, model=None, tokenizer=None, max_retries=3) -> np.ndarray:
-    """Embed a single query using qwen3-embedding with retry logic"""
+def embed_query(text: str, model=None, tokenizer=None, max_retries=3,
+                deadline: Optional[Deadline] = None) -> np.ndarray:
+    """
+    Embed a single query using qwen3-embedding with retry logic
+    
+    With a deadline, each attempt is capped at the remaining budget and
+    retries (including their back-off) only happen while budget remains.
+    Returns an all-zero vector on failure.
+    
+    Raises:
+        DeadlineExceeded: if the request deadline runs out (the caller answers
+        with its timeout response instead of searching with a zero vector)
+    """
     client = get_ollama_client()
     
     for attempt in range(max_retries):
         try:
-            response = client.embeddings(
+            request = dict(
                 model=EMBED_MODEL_ID,
-                prompt=text,
+                input=[text],
                 options={
                     "num_thread": 4,
                 },
                 # Add keep_alive to prevent model unloading
                 keep_alive="5m"
             )
+            if deadline is not None:
+                deadline.check("query embedding")
+                response = call_with_timeout(client.embed, deadline.timeout(EMBED_ATTEMPT_TIMEOUT), **request)
+            else:
+                response = client.embed(**request)
             
-            if 'embedding' in response:
-                vec = np.array([response['embedding']], dtype=np.float32)
+            # Same endpoint as embed()/embed_queries, so query and document vectors stay comparable
+            if response.get('embeddings'):
+                vec = np.array(response['embeddings'][:1], dtype=np.float32)
             else:
                 logger.warning(f"No embedding in response for query: {text[:50]}...")
                 vec = np.zeros((1, EMBED_DIMENSION), dtype=np.float32)
@@ -125,12 +136,47 @@ def embed_query(text: str, model=None, tokenizer=None, max_retries=3) -> np.ndar
             return vec
             
         except Exception as e:
+            if isinstance(e, DeadlineExceeded) and deadline.expired():
+                raise
             logger.error(f"Error embedding query (attempt {attempt + 1}/{max_retries}): {e}")
             
-            if attempt < max_retries - 1:
-                wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
+            wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
+            # Only retry if the back-off leaves time for another attempt
+            has_budget = deadline is None or deadline.remaining() > wait_time + 1
+            if attempt < max_retries - 1 and has_budget:
                 logger.info(f"Retrying in {wait_time} seconds...")
                 time.sleep(wait_time)
             else:
-                logger.error(f"Failed to embed query after {max_retries} attempts")
-                return np.zeros((1, EMBED_DIMENSION), dtype=np.float32)
\ No newline at end of file
+                logger.error(f"Failed to embed query after {attempt + 1} attempts")
+                return np.zeros((1, EMBED_DIMENSION), dtype=np.float32)
+
+def embed_queries(texts: List[str], batch_size: int = 16) -> np.ndarray:
+    """
+    Embed many queries with batched Ollama calls (one request per batch)
+    
+    Returns:
+        numpy array (len(texts), EMBED_DIMENSION) normalized to unit length;
+        rows for failed batches are zero vectors
+    """
+    client = get_ollama_client()
+    embeddings = np.zeros((len(texts), EMBED_DIMENSION), dtype=np.float32)
+    
+    for i in range(0, len(texts), batch_size):
+        batch = texts[i:i + batch_size]
+        try:
+            response = client.embed(
+                model=EMBED_MODEL_ID,
+                input=batch,
+                options={
+                    "num_thread": 4,
+                },
+                keep_alive="5m"
+            )
+            embeddings[i:i + len(batch)] = np.array(response['embeddings'], dtype=np.float32)
+        except Exception as e:
+            logger.error(f"Error embedding query batch {i//batch_size + 1}: {e}")
+    
+    # Normalize embeddings to unit length for cosine similarity
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms = np.where(norms == 0, 1, norms)
+    return embeddings / norms
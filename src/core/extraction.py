@@ -1,3 +1,4 @@
+import json
 import logging
 import time
 from pathlib import Path
@@ -52,9 +53,12 @@ def extract_from_pdf(input_pdf_path: Path, output_dir: Path):
     cleaned_md = clean_markdown(raw_md)
     md_parts = [f"# Extracted Content from {doc_filename}\n", f"<div {direction_tag}>\n", cleaned_md, "</div>"]
 
+    table_pages = {}
     for i, table in enumerate(doc.tables):
         df = table.export_to_dataframe()
         df.to_csv(output_dir / f"{doc_filename}-table-{i+1}.csv", index=False)
+        if table.prov:
+            table_pages[i+1] = table.prov[0].page_no
         table_md = df.to_markdown(index=False)
         md_parts.append(f"\n\n## Table {i+1}\n")
         md_parts.append(table_md)
@@ -62,6 +66,9 @@ def extract_from_pdf(input_pdf_path: Path, output_dir: Path):
         img_path = image_dir / img_name
         table.get_image(doc).save(img_path, "PNG")
 
+    # Page numbers for the structured table index
+    (output_dir / f"{doc_filename}-tables.json").write_text(json.dumps(table_pages), encoding="utf-8")
+
     for i, page in enumerate(doc.pages):
         if hasattr(page, "image") and page.image:
             page_img_name = f"{doc_filename.lower()}_page_{i+1}_img.png"
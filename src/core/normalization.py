@@ -0,0 +1,58 @@
+"""
+Arabic/English text normalization shared by cache keys, fingerprints,
+duplicate detection and keyword matching
+"""
+
+import hashlib
+
+# Arabic-Indic (U+0660-0669) and Extended/Persian (U+06F0-06F9) digits -> ASCII
+_DIGITS = {ord(c): str(i % 10) for i, c in enumerate("٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹")}
+
+# Harakat, Quranic marks, superscript alef and tatweel are dropped
+_REMOVED = [
+    *range(0x0610, 0x061B),
+    *range(0x064B, 0x0660),
+    0x0670,
+    *range(0x06D6, 0x06EE),
+    0x0640,
+]
+
+# Letter variants folded to one form (alef with hamza/madda, alef maqsura, Farsi yeh, ta marbuta)
+_LETTERS = {
+    'آ': 'ا', 'أ': 'ا', 'إ': 'ا', 'ٱ': 'ا',
+    'ى': 'ي', 'ی': 'ي',
+    'ة': 'ه',
+}
+
+# One translation table: a single C-level pass per string
+_TRANSLATION = {
+    **_DIGITS,
+    **{code: None for code in _REMOVED},
+    **{ord(src): dst for src, dst in _LETTERS.items()},
+}
+
+_DIGIT_TRANSLATION = str.maketrans(_DIGITS)
+
+
+def normalize_digits(text: str) -> str:
+    """Convert Arabic-Indic digits to ASCII digits"""
+    return text.translate(_DIGIT_TRANSLATION)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Canonical form of a text for comparisons
+
+    Removes Arabic diacritics and tatweel, folds alef/ya/ta-marbuta variants,
+    converts Arabic-Indic digits, case-folds and collapses whitespace.
+    """
+    if not text:
+        return ""
+    if not text.isascii():
+        text = text.translate(_TRANSLATION)
+    return ' '.join(text.casefold().split())
+
+
+def text_fingerprint(text: str) -> str:
+    """Stable hash of the normalized text (cache keys, duplicate detection)"""
+    return hashlib.sha1(normalize_text(text).encode('utf-8')).hexdigest()
@@ -6,6 +6,17 @@ import time
 
 logger = logging.getLogger(__name__)
 
+# Chunk metadata stored alongside the text when present
+OPTIONAL_PAYLOAD_FIELDS = ("chunk_id", "token_count", "parent_id", "level", "section")
+
+def _build_payload(chunk):
+    """Build the Qdrant payload for a chunk"""
+    payload = {"text": chunk["text"]}
+    for field in OPTIONAL_PAYLOAD_FIELDS:
+        if field in chunk:
+            payload[field] = chunk[field]
+    return payload
+
 def test_qdrant_connection(host='localhost', port=6333, max_retries=5):
     """Test Qdrant connection with retries"""
     for attempt in range(max_retries):
@@ -132,7 +143,7 @@ def upload_points(qdrant, collection_name, vectors, chunks, batch_size=100):
                 PointStruct(
                     id=idx, 
                     vector=vec.tolist(), 
-                    payload={"text": chunk["text"]}
+                    payload=_build_payload(chunk)
                 )
                 for idx, (vec, chunk) in enumerate(zip(batch_vectors, batch_chunks), start=i)
             ]
@@ -159,6 +170,38 @@ def upload_points(qdrant, collection_name, vectors, chunks, batch_size=100):
         logger.error(f"Failed to upload points: {e}")
         raise
 
+def create_parent_store(collection_name, host='localhost', port=6333):
+    """
+    Create a payload-only store for parent sections (small-to-big retrieval)
+    
+    Parents are fetched by id, never searched, so they get a 1-dim placeholder vector.
+    """
+    return create_qdrant_collection(collection_name, 1, host=host, port=port)
+
+def upload_parents(qdrant, collection_name, parents, batch_size=100):
+    """Upload parent sections ({'id', 'text', ...}) to a parent store"""
+    try:
+        for i in range(0, len(parents), batch_size):
+            points = [
+                PointStruct(id=parent["id"], vector=[1.0], payload=_build_payload(parent))
+                for parent in parents[i:i + batch_size]
+            ]
+            qdrant.upload_points(collection_name=collection_name, points=points, wait=True)
+        logger.info(f"✅ Uploaded {len(parents)} parent sections to '{collection_name}'")
+    except Exception as e:
+        logger.error(f"Failed to upload parent sections: {e}")
+        raise
+
+def fetch_parents(qdrant, collection_name, parent_ids):
+    """Fetch parent sections by id, as {id: payload}"""
+    points = qdrant.retrieve(
+        collection_name=collection_name,
+        ids=list(parent_ids),
+        with_payload=True,
+        with_vectors=False
+    )
+    return {point.id: point.payload for point in points}
+
 def search_collection(qdrant, collection_name, query_vector, limit=5, with_payload=True):
     """Search collection with error handling"""
     try:
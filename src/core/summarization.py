@@ -0,0 +1,98 @@
+"""
+Hierarchical report summaries (section level and report level) built at ingestion time
+"""
+
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+import logging
+import re
+
+from .text_utils import estimate_tokens, split_sentences, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+_WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+_NUMBER_PATTERN = re.compile(r'\d')
+
+# Input cap per summarization call (keeps LLM prompts small)
+MAX_SUMMARY_INPUT_TOKENS = 3000
+
+# summarize(text, max_tokens) -> summary or None (e.g. LLM unavailable)
+Summarizer = Callable[[str, int], Optional[str]]
+
+
+def extractive_summary(text: str, max_tokens: int) -> str:
+    """
+    Offline summary: the most informative sentences, in original order
+
+    Sentences are scored by the document frequency of their words (favouring
+    sentences with figures) and picked greedily until the token budget is full.
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return ""
+
+    words = [[w for w in _WORD_PATTERN.findall(s.lower()) if len(w) > 3] for s in sentences]
+    frequency = Counter(w for sentence_words in words for w in set(sentence_words))
+
+    def score(i: int) -> float:
+        if not words[i]:
+            return 0.0
+        base = sum(frequency[w] for w in words[i]) / len(words[i])
+        return base * (1.5 if _NUMBER_PATTERN.search(sentences[i]) else 1.0)
+
+    chosen, used = set(), 0
+    for i in sorted(range(len(sentences)), key=score, reverse=True):
+        tokens = estimate_tokens(sentences[i])
+        if used + tokens > max_tokens:
+            continue
+        chosen.add(i)
+        used += tokens
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+
+def _summarize(text: str, max_tokens: int, summarizer: Optional[Summarizer]) -> str:
+    """Summarize with the given summarizer, falling back to extractive"""
+    text = truncate_to_tokens(text, MAX_SUMMARY_INPUT_TOKENS) or text[:MAX_SUMMARY_INPUT_TOKENS * 4]
+    if summarizer is not None:
+        try:
+            summary = summarizer(text, max_tokens)
+            if summary:
+                return summary
+        except Exception as e:
+            logger.warning(f"Summarizer failed, using extractive summary: {e}")
+    return extractive_summary(text, max_tokens)
+
+
+def build_report_summaries(
+    chunks: List[Dict],
+    summarizer: Optional[Summarizer] = None,
+    section_tokens: int = 200,
+    report_tokens: int = 400
+) -> List[Dict]:
+    """
+    Build section-level and report-level summaries for one report
+
+    Args:
+        chunks: chunk dicts with 'text' and optional 'section' (top heading), in document order
+        summarizer: LLM-backed summarizer; extractive summaries are used when None or failing
+
+    Returns:
+        summary dicts with 'text', 'level' ('section' or 'report') and 'section'
+    """
+    sections: Dict[str, List[str]] = {}
+    for chunk in chunks:
+        sections.setdefault(chunk.get('section') or 'General', []).append(chunk['text'])
+
+    summaries = []
+    for section, texts in sections.items():
+        text = _summarize("\n".join(texts), section_tokens, summarizer)
+        if text:
+            summaries.append({'text': f"{section}: {text}", 'level': 'section', 'section': section})
+    logger.info(f"Built {len(summaries)} section summaries")
+
+    if summaries:
+        overview = _summarize("\n".join(s['text'] for s in summaries), report_tokens, summarizer)
+        if overview:
+            summaries.append({'text': overview, 'level': 'report', 'section': None})
+    return summaries
@@ -0,0 +1,231 @@
+"""
+Structured table index: report tables (exported to CSV at extraction time)
+stored in SQLite with normalized numeric values for direct KPI lookups
+"""
+
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import logging
+import re
+import sqlite3
+
+import pandas as pd
+
+from .config import TABLE_INDEX_PATH
+from .normalization import normalize_digits, normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Arabic thousands and decimal separators
+_SEPARATOR_TRANSLATION = str.maketrans('٬٫', ',.')
+_NUMBER_PATTERN = re.compile(r'(\()?\s*(-|−)?\s*(\d[\d,]*(?:\.\d+)?)\s*(\))?')
+
+# Scale words in cells or headers -> multiplier (values are stored in base units)
+_SCALES = [
+    (re.compile(r'\b(?:trillion|tn)\b|تريليون', re.IGNORECASE), 1e12),
+    (re.compile(r'\b(?:billion|bn)\b|مليار', re.IGNORECASE), 1e9),
+    (re.compile(r'\b(?:million|mn)\b|مليون', re.IGNORECASE), 1e6),
+    (re.compile(r'\bthousand\b|ألف|الف', re.IGNORECASE), 1e3),
+]
+_UNITS = [
+    (re.compile(r'%|percent|بالمائة|في المائة'), 'percent'),
+    (re.compile(r'\bSAR\b|\bSR\b|ريال', re.IGNORECASE), 'SAR'),
+    (re.compile(r'\bUSD\b|US\$|\$|دولار', re.IGNORECASE), 'USD'),
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS table_cells (
+    doc TEXT NOT NULL,
+    year TEXT,
+    language TEXT,
+    table_no INTEGER,
+    page INTEGER,
+    row_no INTEGER,
+    row_label TEXT,
+    column_label TEXT,
+    row_key TEXT,
+    column_key TEXT,
+    raw_value TEXT,
+    value REAL,
+    unit TEXT,
+    row_text TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_table_cells_doc ON table_cells (doc);
+CREATE INDEX IF NOT EXISTS idx_table_cells_year ON table_cells (year, language);
+"""
+
+
+def parse_number(raw: str, context: str = "") -> Tuple[Optional[float], Optional[str]]:
+    """
+    Parse a table cell into (value in base units, unit)
+
+    Handles thousands separators, Arabic-Indic digits, negatives in parentheses and
+    scale words ("SAR bn", "مليار"). Scale and unit may come from `context`
+    (row label and column header). Returns (None, None) for non-numeric cells.
+    """
+    text = normalize_digits(str(raw)).translate(_SEPARATOR_TRANSLATION).strip()
+    match = _NUMBER_PATTERN.search(text)
+    residual = _NUMBER_PATTERN.sub(' ', text).strip(' %$')
+    if not match or (residual and not _has_unit_words(residual)):
+        return None, None
+
+    value = float(match.group(3).replace(',', ''))
+    if match.group(2) or (match.group(1) and match.group(4)):
+        value = -value
+
+    described = f"{text} {context}"
+    unit = next((name for pattern, name in _UNITS if pattern.search(described)), None)
+    if unit != 'percent':
+        scale = next((factor for pattern, factor in _SCALES if pattern.search(described)), 1.0)
+        value *= scale
+    return value, unit
+
+
+def _has_unit_words(text: str) -> bool:
+    return any(p.search(text) for p, _ in _SCALES) or any(p.search(text) for p, _ in _UNITS)
+
+
+def _fixed(value: float) -> str:
+    """Fixed-point with at most two decimals and no trailing zeros ("120.5", "1,000")"""
+    return f"{value:,.2f}".rstrip('0').rstrip('.')
+
+
+def format_value(value: float, unit: Optional[str] = None) -> str:
+    """Render a normalized value compactly ("SAR 2.87 trillion", "12.5%"), the same way for every report"""
+    if unit == 'percent':
+        return f"{value:g}%"
+    magnitude = abs(value)
+    for name, factor in (('trillion', 1e12), ('billion', 1e9), ('million', 1e6)):
+        if magnitude >= factor:
+            number = f"{_fixed(value / factor)} {name}"
+            break
+    else:
+        number = _fixed(value)
+    return f"{unit} {number}" if unit else number
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _table_pages(output_dir: Path, doc_filename: str) -> Dict[int, int]:
+    """Page number per table, from the sidecar written by extract_from_pdf (if any)"""
+    pages_file = output_dir / f"{doc_filename}-tables.json"
+    if not pages_file.exists():
+        return {}
+    return {int(k): v for k, v in json.loads(pages_file.read_text(encoding="utf-8")).items()}
+
+
+def _table_rows(df: pd.DataFrame, doc: str, year: Optional[str], language: Optional[str],
+                table_no: int, page: Optional[int]) -> List[tuple]:
+    """Long-format cell rows for one table: the first text column is the row label"""
+    df = df.fillna('').astype(str)
+    columns = [str(c) for c in df.columns]
+    rows = []
+    for row_no, values in enumerate(df.itertuples(index=False), 1):
+        values = [v.strip() for v in values]
+        row_label = next((v for v in values if v and parse_number(v)[0] is None), '')
+        row_text = " | ".join(
+            f"{column}: {value}" if not column.startswith('Unnamed') else value
+            for column, value in zip(columns, values) if value
+        )
+        for column, value in zip(columns, values):
+            if not value:
+                continue
+            number, unit = parse_number(value, f"{row_label} {column}")
+            if number is None:
+                continue
+            rows.append((doc, year, language, table_no, page, row_no, row_label, column,
+                         normalize_text(row_label), normalize_text(column), value, number, unit, row_text))
+    return rows
+
+
+def index_report_tables(output_dir: Path, doc_filename: str, year: Optional[str] = None,
+                        language: Optional[str] = None, db_path: str = TABLE_INDEX_PATH) -> int:
+    """
+    Load a report's table CSVs ('{doc_filename}-table-{i}.csv') into the table index
+
+    Existing rows for the report are replaced. Returns the number of numeric cells indexed.
+    """
+    output_dir = Path(output_dir)
+    pages = _table_pages(output_dir, doc_filename)
+    pattern = re.compile(rf'^{re.escape(doc_filename)}-table-(\d+)\.csv$')
+
+    rows = []
+    for csv_path in sorted(output_dir.glob(f"{doc_filename}-table-*.csv")):
+        match = pattern.match(csv_path.name)
+        if not match:
+            continue
+        table_no = int(match.group(1))
+        try:
+            df = pd.read_csv(csv_path, dtype=str)
+        except Exception as e:
+            logger.warning(f"Skipping unreadable table {csv_path.name}: {e}")
+            continue
+        rows.extend(_table_rows(df, doc_filename, year, language, table_no, pages.get(table_no)))
+
+    with closing(_connect(db_path)) as conn, conn:
+        conn.execute("DELETE FROM table_cells WHERE doc = ?", (doc_filename,))
+        conn.executemany("INSERT INTO table_cells VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    logger.info(f"✅ Indexed {len(rows)} numeric table cells for {doc_filename}")
+    return len(rows)
+
+
+def query_table_rows(terms: Iterable[str], years: Optional[Iterable[str]] = None,
+                     language: Optional[str] = None, limit: int = 20,
+                     db_path: str = TABLE_INDEX_PATH) -> List[Dict]:
+    """
+    Table rows whose label or column header contains any of the terms
+    (compared in normalized form, see normalize_text)
+
+    Returns one dict per matching table row (doc, year, table_no, page, row_no,
+    row_label, row_text, and 'cells': [{'column', 'value', 'unit'}] with values
+    in base units), ordered by year and position in the report.
+    """
+    terms = [normalize_text(t) for t in terms if t]
+    if not terms or not Path(db_path).exists():
+        return []
+
+    conditions = ["(" + " OR ".join(["row_key LIKE ? OR column_key LIKE ?"] * len(terms)) + ")"]
+    params = [f"%{t}%" for t in terms for _ in range(2)]
+    years = list(years or [])
+    if years:
+        conditions.append(f"year IN ({', '.join('?' * len(years))})")
+        params.extend(years)
+    if language:
+        conditions.append("language = ?")
+        params.append(language)
+
+    # Every numeric cell of the first `limit` matching rows
+    sql = f"""
+        WITH matched AS (
+            SELECT DISTINCT doc, table_no, row_no, year
+            FROM table_cells
+            WHERE {' AND '.join(conditions)}
+            ORDER BY year, table_no, row_no
+            LIMIT ?
+        )
+        SELECT c.doc, c.year, c.table_no, c.page, c.row_no, c.row_label, c.row_text,
+               c.column_label, c.value, c.unit
+        FROM table_cells c
+        JOIN matched m ON c.doc = m.doc AND c.table_no = m.table_no AND c.row_no = m.row_no
+        ORDER BY c.year, c.table_no, c.row_no, c.rowid
+    """
+    rows: Dict[tuple, Dict] = {}
+    with closing(sqlite3.connect(db_path)) as conn:
+        conn.row_factory = sqlite3.Row
+        for cell in conn.execute(sql, [*params, limit]):
+            key = (cell['doc'], cell['table_no'], cell['row_no'])
+            if key not in rows:
+                rows[key] = {name: cell[name] for name in
+                             ('doc', 'year', 'table_no', 'page', 'row_no', 'row_label', 'row_text')}
+                rows[key]['cells'] = []
+            rows[key]['cells'].append({'column': cell['column_label'], 'value': cell['value'], 'unit': cell['unit']})
+    return list(rows.values())
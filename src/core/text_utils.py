@@ -0,0 +1,42 @@
+"""
+Lightweight text helpers shared by retrieval and generation
+(token estimation and sentence splitting without loading a tokenizer)
+"""
+
+import re
+from typing import List
+
+# Sentence ends: Latin and Arabic punctuation followed by whitespace, or line breaks
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?؟۔])\s+|\n+')
+
+# Rough characters-per-token ratios for LLM tokenizers
+_CHARS_PER_TOKEN = 4.0
+_CHARS_PER_TOKEN_ARABIC = 2.5
+_ARABIC_CHAR = re.compile(r'[؀-ۿ]')
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text (Arabic script tokenizes denser than Latin)"""
+    if not text:
+        return 0
+    arabic_chars = len(_ARABIC_CHAR.findall(text))
+    other_chars = len(text) - arabic_chars
+    return int(other_chars / _CHARS_PER_TOKEN + arabic_chars / _CHARS_PER_TOKEN_ARABIC) + 1
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences, keeping non-empty parts only"""
+    return [part.strip() for part in _SENTENCE_BOUNDARY.split(text) if part and part.strip()]
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Truncate text at a sentence boundary so it fits within max_tokens (may return '')"""
+    kept = []
+    used = 0
+    for sentence in split_sentences(text):
+        tokens = estimate_tokens(sentence)
+        if used + tokens > max_tokens:
+            break
+        kept.append(sentence)
+        used += tokens
+    return " ".join(kept)
@@ -0,0 +1,47 @@
+"""
+High-resolution per-stage timing for the RAG pipeline
+"""
+
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional
+import threading
+import time
+
+
+class StageTimer:
+    """Records named stages relative to the start of one request"""
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages: List[Dict] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block of code as a named stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.stages.append({
+                    'name': name,
+                    'start_ms': (start - self._origin) * 1000,
+                    'duration_ms': (end - start) * 1000
+                })
+
+    def total_ms(self) -> float:
+        """Milliseconds elapsed since the timer was created"""
+        return (time.perf_counter() - self._origin) * 1000
+
+    def to_dict(self) -> Dict:
+        """Structured timings: total and stages ordered by start time"""
+        with self._lock:
+            stages = sorted(self.stages, key=lambda s: s['start_ms'])
+        return {'total_ms': self.total_ms(), 'stages': stages}
+
+
+def timed(timer: Optional[StageTimer], name: str):
+    """Stage context for an optional timer (no-op when timer is None)"""
+    return timer.stage(name) if timer is not None else nullcontext()
@@ -0,0 +1,99 @@
+"""
+Complexity-based model routing
+Scores a question (length, comparative/summary intent, context size) and picks a
+named tier (model + output-token cap) from model_tiers in llm_proxy_config.yaml
+"""
+
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+import logging
+import threading
+
+from src.core.config import PROMPT_TOKEN_BUDGET
+from src.core.text_utils import estimate_tokens
+from src.llm.latency_router import LatencyTracker
+from src.llm.proxy_config import get_fallback_chain, get_model_tiers
+
+logger = logging.getLogger(__name__)
+
+# Score weights (sum to 1) and the question length that counts as fully "long"
+_LENGTH_WEIGHT = 0.2
+_INTENT_WEIGHT = 0.45
+_CONTEXT_WEIGHT = 0.35
+_LONG_QUESTION_TOKENS = 40
+
+
+class ModelTier(NamedTuple):
+    name: str
+    model: str
+    max_tokens: int
+    max_score: float  # Highest complexity score this tier serves
+
+
+def score_complexity(question: str, context: str = "", is_multi_year: bool = False,
+                     is_broad: bool = False) -> float:
+    """
+    Complexity in [0, 1]
+
+    Multi-year comparisons (questions with a comparison plan, not just comparative
+    wording like "growth in 2023") weigh most, then summary/overview questions;
+    long questions and large retrieved contexts push the score up.
+    """
+    length = min(estimate_tokens(question) / _LONG_QUESTION_TOKENS, 1.0)
+    intent = 1.0 if is_multi_year else 0.8 if is_broad else 0.0
+    context_size = min(estimate_tokens(context) / PROMPT_TOKEN_BUDGET, 1.0)
+    return _LENGTH_WEIGHT * length + _INTENT_WEIGHT * intent + _CONTEXT_WEIGHT * context_size
+
+
+class ComplexityRouter:
+    """Maps complexity scores to tiers and records per-tier latency (thread-safe)"""
+
+    def __init__(self, config_path: Optional[Path] = None):
+        self.tiers: List[ModelTier] = []
+        for entry in get_model_tiers(config_path):
+            try:
+                self.tiers.append(ModelTier(
+                    name=entry["name"],
+                    model=entry["model"],
+                    max_tokens=int(entry["max_tokens"]),
+                    max_score=float(entry.get("max_score", 1.0))
+                ))
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Skipping invalid model tier {entry}: {e}")
+        self.tiers.sort(key=lambda tier: tier.max_score)
+        # Tier model + its proxy fallbacks: the tier keeps a fallback chain of its own
+        self.chains: Dict[str, List[str]] = {}
+        for tier in self.tiers:
+            self.chains[tier.name] = get_fallback_chain(tier.model, config_path)
+            if len(self.chains[tier.name]) == 1:
+                logger.warning(f"Model tier {tier.name} calls {tier.model}, which has no proxy fallbacks")
+        self.latency = LatencyTracker()
+        self.counts: Dict[str, int] = {tier.name: 0 for tier in self.tiers}
+        self._lock = threading.Lock()
+
+    def select(self, score: float) -> Optional[ModelTier]:
+        """First tier whose max_score covers the score (the last tier above all of them); None without tiers"""
+        if not self.tiers:
+            return None
+        tier = next((tier for tier in self.tiers if score <= tier.max_score), self.tiers[-1])
+        with self._lock:
+            self.counts[tier.name] += 1
+        return tier
+
+    def record(self, tier: ModelTier, seconds: float):
+        self.latency.record(tier.name, seconds)
+
+    def stats(self) -> Dict[str, Dict]:
+        """{tier: {'model', 'requests', 'ewma', 'p95'}}"""
+        latency = self.latency.snapshot()
+        with self._lock:
+            counts = dict(self.counts)
+        return {
+            tier.name: {
+                'model': tier.model,
+                'requests': counts[tier.name],
+                'ewma': latency.get(tier.name, {}).get('ewma'),
+                'p95': latency.get(tier.name, {}).get('p95'),
+            }
+            for tier in self.tiers
+        }
@@ -0,0 +1,140 @@
+"""
+Background health monitoring and circuit breaking for the LLM proxy
+Request paths read cached state instead of probing the proxy on every call
+"""
+
+from typing import Callable, Optional
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.core.config import (
+    HEALTH_CHECK_INTERVAL,
+    HEALTH_CHECK_TIMEOUT,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker (thread-safe)
+
+    closed: calls pass; opens after `failure_threshold` consecutive failures.
+    open: calls are rejected until `reset_timeout` seconds have passed.
+    half_open: a single probe call is let through; its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Whether a call may be attempted now (lets one probe through once the reset timeout passes)"""
+        if self.state == self.CLOSED:
+            return True
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                logger.info("🔌 Circuit half-open, probing LLM proxy")
+                return True
+            return self.state == self.CLOSED
+
+    def release_probe(self):
+        """Give back a half-open probe whose call never reached the proxy (e.g. rate limited locally)"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN  # Cooldown already served: the next request probes
+
+    def record_success(self):
+        if self.state == self.CLOSED and not self.failures:
+            return
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("✅ Circuit closed, LLM proxy recovered")
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"⚠️  Circuit open after {self.failures} consecutive failures")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class ProxyHealthMonitor:
+    """
+    Polls the proxy's liveness endpoint on a daemon thread over a pooled HTTP session
+
+    /health/liveliness only says the proxy process is serving; LiteLLM's /health
+    sends a real completion to every configured model, which would spend provider
+    quota on each poll. Upstream model failures surface through the circuit
+    breaker instead.
+    """
+
+    def __init__(self, base_url: str, interval: float = HEALTH_CHECK_INTERVAL,
+                 timeout: float = HEALTH_CHECK_TIMEOUT,
+                 on_change: Optional[Callable[[bool], None]] = None):
+        self.health_url = f"{base_url}/health/liveliness"
+        self.interval = interval
+        self.timeout = timeout
+        self.on_change = on_change
+        self.healthy = False
+        self.last_checked: Optional[float] = None
+
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self, timeout: Optional[float] = None) -> bool:
+        """Probe the liveness endpoint once and update the cached state"""
+        try:
+            response = self._session.get(self.health_url, timeout=timeout or self.timeout)
+            healthy = response.status_code == 200
+        except requests.RequestException:
+            healthy = False
+
+        changed = healthy != self.healthy
+        self.healthy = healthy
+        self.last_checked = time.monotonic()
+        if changed:
+            logger.info(f"{'✅' if healthy else '❌'} LLM proxy {'healthy' if healthy else 'unreachable'}")
+            if self.on_change:
+                self.on_change(healthy)
+        return healthy
+
+    def start(self):
+        """Start background polling (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="llm-proxy-health", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.warning(f"Health check error: {e}")
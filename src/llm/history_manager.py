@@ -0,0 +1,161 @@
+"""
+Chat history management for prompts
+Keeps recent turns verbatim within a token budget and folds older turns
+into a rolling extractive summary
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Union
+import hashlib
+import re
+import threading
+
+from src.core.config import (
+    HISTORY_TOKEN_RESERVE,
+    HISTORY_RECENT_MESSAGES,
+    HISTORY_SUMMARY_TOKENS,
+    HISTORY_SUMMARY_CACHE_SIZE
+)
+from src.core.text_utils import estimate_tokens, split_sentences, truncate_to_tokens
+
+# UI artifacts appended to assistant messages (debug mode) - never sent to the LLM
+_UI_ARTIFACTS = re.compile(r'\n*\*\*(?:🔍 Debug Info|⏱️ Timings):\*\*.*', re.DOTALL)
+
+_MAX_SUMMARY_LINE_TOKENS = 60
+
+
+class PreparedHistory(NamedTuple):
+    """History as it goes into a prompt: rolling summary of older turns + recent messages"""
+    summary: str
+    recent: List[Dict]
+
+
+class _SessionSummary(NamedTuple):
+    end: int  # Messages summarized (index after the last summarized turn)
+    last_key: str  # Fingerprint of the last summarized message, to detect a changed history
+    lines: List[str]
+
+
+# Raw chat messages or the result of prepare_history
+History = Union[List[Dict], PreparedHistory]
+
+# Rolling summary per chat session (LRU over sessions); extended as the conversation grows
+_summary_cache: "OrderedDict[str, _SessionSummary]" = OrderedDict()
+_summary_cache_lock = threading.Lock()
+
+
+def clean_message(content: str) -> str:
+    """Remove debug/UI blocks from a chat message"""
+    return _UI_ARTIFACTS.sub('', content or '').strip()
+
+
+def _message_key(msg: Dict) -> str:
+    return hashlib.sha1(f"{msg['role']}\x00{msg['content']}".encode('utf-8')).hexdigest()
+
+
+def _summary_line(msg: Dict) -> str:
+    """One compact line for a message: the question verbatim, the first sentence of an answer"""
+    if msg['role'] == 'user':
+        return "Q: " + (truncate_to_tokens(msg['content'], _MAX_SUMMARY_LINE_TOKENS) or msg['content'][:200])
+    sentences = split_sentences(msg['content'])
+    first = sentences[0] if sentences else ''
+    return "A: " + (truncate_to_tokens(first, _MAX_SUMMARY_LINE_TOKENS) or first[:200])
+
+
+def _trim_summary(lines: List[str], max_tokens: int) -> List[str]:
+    """Drop the oldest lines until the summary fits"""
+    total = sum(estimate_tokens(line) for line in lines)
+    start = 0
+    while start < len(lines) and total > max_tokens:
+        total -= estimate_tokens(lines[start])
+        start += 1
+    return lines[start:]
+
+
+def _rolling_summary(older: List[Dict], session_id: Optional[str] = None) -> List[str]:
+    """
+    Summary lines for `older`
+
+    With a session_id, the session's cached summary is extended with the turns
+    added since its last summarized turn (only new messages are summarized);
+    without one, the summary is built from scratch.
+    """
+    if not older:
+        return []
+    if session_id is None:
+        return _trim_summary([_summary_line(msg) for msg in older], HISTORY_SUMMARY_TOKENS)
+
+    with _summary_cache_lock:
+        cached = _summary_cache.get(session_id)
+    start, lines = 0, []
+    if cached is not None and cached.end <= len(older) and _message_key(older[cached.end - 1]) == cached.last_key:
+        if cached.end == len(older):
+            return cached.lines
+        start, lines = cached.end, list(cached.lines)
+
+    lines = _trim_summary(lines + [_summary_line(msg) for msg in older[start:]], HISTORY_SUMMARY_TOKENS)
+
+    with _summary_cache_lock:
+        _summary_cache[session_id] = _SessionSummary(len(older), _message_key(older[-1]), lines)
+        _summary_cache.move_to_end(session_id)
+        if len(_summary_cache) > HISTORY_SUMMARY_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
+    return lines
+
+
+def _fit_recent(messages: List[Dict], budget: int) -> List[Dict]:
+    """Newest messages (at most HISTORY_RECENT_MESSAGES) that fit in the budget, oldest first"""
+    recent, used = [], 0
+    for msg in reversed(messages[-HISTORY_RECENT_MESSAGES:]):
+        tokens = estimate_tokens(msg['content'])
+        if used + tokens > budget:
+            if not recent:
+                # Keep the start of an oversized latest message rather than nothing
+                truncated = truncate_to_tokens(msg['content'], budget)
+                if truncated:
+                    recent.insert(0, {'role': msg['role'], 'content': truncated})
+            break
+        recent.insert(0, msg)
+        used += tokens
+    return recent
+
+
+def prepare_history(chat_history: History, token_budget: int = HISTORY_TOKEN_RESERVE,
+                    session_id: Optional[str] = None) -> PreparedHistory:
+    """
+    Fit chat history into a token budget
+
+    The newest messages are kept verbatim (at most HISTORY_RECENT_MESSAGES) while
+    they fit in the budget left after the summary; everything older is folded
+    into a rolling summary, cached per session_id and extended incrementally.
+    Prepare once per request and pass the result on: an already prepared
+    history is returned unchanged.
+
+    Returns:
+        PreparedHistory (summary text, recent messages as {'role', 'content'} dicts, oldest first)
+    """
+    if isinstance(chat_history, PreparedHistory):
+        return chat_history
+
+    messages = [
+        {'role': msg['role'], 'content': clean_message(msg.get('content', ''))}
+        for msg in (chat_history or [])
+    ]
+    messages = [msg for msg in messages if msg['content']]
+    if not messages:
+        return PreparedHistory("", [])
+
+    recent = _fit_recent(messages, token_budget)
+    if len(recent) < len(messages):
+        # Something has to be summarized - leave room for the summary
+        recent = _fit_recent(messages, max(token_budget - HISTORY_SUMMARY_TOKENS, 0))
+
+    older = messages[:len(messages) - len(recent)]
+    summary = "\n".join(_rolling_summary(older, session_id))
+    return PreparedHistory(summary, recent)
+
+
+def history_token_count(chat_history: History, token_budget: int = HISTORY_TOKEN_RESERVE) -> int:
+    """Tokens the prepared history will take in the prompt"""
+    summary, recent = prepare_history(chat_history, token_budget)
+    return estimate_tokens(summary) + sum(estimate_tokens(msg['content']) for msg in recent)
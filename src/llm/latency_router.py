@@ -0,0 +1,131 @@
+"""
+Latency-aware routing across the proxy's fallback models
+Tracks per-model latency (EWMA + p95) and hedges slow calls to a backup model
+"""
+
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import math
+import threading
+import time
+
+from src.core.config import (
+    LATENCY_EWMA_ALPHA,
+    LATENCY_WINDOW,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_DEFAULT_DELAY,
+    HEDGE_MIN_DELAY
+)
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Per-model latency statistics (thread-safe)"""
+
+    def __init__(self, alpha: float = LATENCY_EWMA_ALPHA, window: int = LATENCY_WINDOW):
+        self.alpha = alpha
+        self.window = window
+        self._ewma: Dict[str, float] = {}
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, seconds: float):
+        with self._lock:
+            previous = self._ewma.get(model)
+            self._ewma[model] = seconds if previous is None else self.alpha * seconds + (1 - self.alpha) * previous
+            self._samples.setdefault(model, deque(maxlen=self.window)).append(seconds)
+
+    def ewma(self, model: str) -> Optional[float]:
+        return self._ewma.get(model)
+
+    def p95(self, model: str) -> Optional[float]:
+        """95th percentile of recent latencies (None until HEDGE_MIN_SAMPLES are recorded)"""
+        with self._lock:
+            samples = sorted(self._samples.get(model, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(math.ceil(0.95 * len(samples)) - 1, len(samples) - 1)]
+
+    def hedge_delay(self, model: str) -> float:
+        """Seconds to wait on a model before hedging: its p95, or the default while unknown"""
+        p95 = self.p95(model)
+        return max(p95, HEDGE_MIN_DELAY) if p95 is not None else HEDGE_DEFAULT_DELAY
+
+    def fastest(self, models: List[str]) -> Optional[str]:
+        """Model with the lowest EWMA (untried models first, then config order on ties)"""
+        if not models:
+            return None
+        return min(models, key=lambda model: self._ewma.get(model, 0.0))
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """{model: {'ewma', 'p95', 'samples'}} for logging and debugging"""
+        return {
+            model: {'ewma': self._ewma.get(model), 'p95': self.p95(model),
+                    'samples': len(self._samples.get(model, ()))}
+            for model in list(self._ewma)
+        }
+
+
+async def hedged_call(call: Callable[[str], Awaitable], models: List[str],
+                      tracker: LatencyTracker) -> Tuple[object, str]:
+    """
+    Run call(model) on the primary model, hedging to one backup model
+
+    The backup (fastest of the remaining models by EWMA) starts when the primary
+    passes its p95 budget, or immediately if the primary fails first. The first
+    successful response wins and the other call is cancelled. A cancelled call's
+    elapsed time is recorded as a latency sample, so a slow model's p95 keeps up.
+
+    Returns (result, model). Raises the last error if every attempt failed.
+    """
+    primary = models[0]
+    backup = tracker.fastest(models[1:])
+    tasks: Dict[asyncio.Task, str] = {}
+
+    async def attempt(model: str):
+        started = time.monotonic()
+        try:
+            result = await call(model)
+        except asyncio.CancelledError:
+            tracker.record(model, time.monotonic() - started)
+            raise
+        tracker.record(model, time.monotonic() - started)
+        return result
+
+    def launch(model: str) -> asyncio.Task:
+        task = asyncio.ensure_future(attempt(model))
+        tasks[task] = model
+        return task
+
+    pending = {launch(primary)}
+    last_error: Optional[BaseException] = None
+    try:
+        while pending:
+            timeout = tracker.hedge_delay(primary) if backup else None
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+            if not done:
+                logger.info(f"⏱️  {primary} over its latency budget ({timeout:.1f}s), hedging to {backup}")
+                pending.add(launch(backup))
+                backup = None
+                continue
+
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), tasks[task]
+                last_error = task.exception()
+                logger.warning(f"{tasks[task]} failed: {last_error}")
+
+            if backup:
+                pending.add(launch(backup))
+                backup = None
+    finally:
+        # Cancel the loser (or everything, if the caller itself was cancelled)
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+    raise last_error
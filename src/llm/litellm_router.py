@@ -0,0 +1,83 @@
+"""
+In-process LiteLLM Router built from config/llm_proxy_config.yaml
+Same models, fallbacks and timeouts as the proxy server, without the localhost HTTP hop
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+import logging
+
+from src.llm.proxy_config import load_proxy_config
+
+logger = logging.getLogger(__name__)
+
+
+def build_router(config_path: Optional[Path] = None):
+    """
+    Create a litellm.Router from the proxy config
+
+    model_list (including "os.environ/..." keys, which the Router resolves),
+    litellm_settings fallbacks/num_retries/request_timeout and router_settings
+    are carried over. Raises ImportError if litellm is not installed.
+    """
+    import litellm
+    from litellm import Router
+
+    config = load_proxy_config(config_path)
+    settings = config.get("litellm_settings", {}) or {}
+    model_list = config.get("model_list", []) or []
+    if not model_list:
+        raise ValueError("No model_list in LLM proxy config")
+
+    litellm.drop_params = settings.get("drop_params", True)
+    litellm.telemetry = settings.get("telemetry", False)
+
+    router = Router(
+        model_list=model_list,
+        fallbacks=settings.get("fallbacks", []),
+        num_retries=settings.get("num_retries", 1),
+        timeout=settings.get("request_timeout"),
+        **(config.get("router_settings", {}) or {})
+    )
+    logger.info(f"✅ LiteLLM Router ready in-process ({len(model_list)} deployments)")
+    return router
+
+
+class RouterClient:
+    """
+    OpenAI-client-shaped wrapper around a Router
+
+    Supports the calls LLMProxyManager makes: chat.completions.create(...) and
+    with_options(timeout=..., max_retries=...). Router responses and stream chunks
+    have the OpenAI shape, and its errors subclass the openai exception types.
+    """
+
+    def __init__(self, router, **defaults):
+        self.router = router
+        self.defaults = defaults
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def with_options(self, timeout: Optional[float] = None, max_retries: Optional[int] = None) -> "RouterClient":
+        defaults = dict(self.defaults)
+        if timeout is not None:
+            defaults["timeout"] = timeout
+        if max_retries is not None:
+            defaults["num_retries"] = max_retries
+        return type(self)(self.router, **defaults)
+
+    def _params(self, kwargs):
+        # extra_body goes into the request body on the HTTP client; here it is plain kwargs
+        params = {**self.defaults, **kwargs}
+        params.update(params.pop("extra_body", None) or {})
+        return params
+
+    def _create(self, **kwargs):
+        return self.router.completion(**self._params(kwargs))
+
+
+class AsyncRouterClient(RouterClient):
+    """Async variant: chat.completions.create returns a coroutine (Router.acompletion)"""
+
+    def _create(self, **kwargs):
+        return self.router.acompletion(**self._params(kwargs))
@@ -3,15 +3,48 @@ LLM Proxy Manager for RAG Answer Generation
 Handles Groq + Ollama Cloud integration with fallback mechanisms
 """
 
+import asyncio
+import hashlib
+import json
 import logging
+import logging.handlers
 import openai
-from typing import Optional, Dict, List
+from collections import deque
+from typing import Optional, Dict, Iterator, List, Tuple
 import subprocess
+import threading
 import time
-import requests
 import os
+import weakref
 from pathlib import Path
 from dotenv import load_dotenv
+from src.core.timing import StageTimer, timed
+from src.core.deadline import Deadline
+from src.llm.prompt_builder import build_prompt, PromptCacheStats
+from src.llm.complexity_router import ComplexityRouter, ModelTier
+from src.llm.health_monitor import CircuitBreaker, ProxyHealthMonitor
+from src.llm.history_manager import History
+from src.llm.latency_router import LatencyTracker, hedged_call
+from src.llm.proxy_config import get_fallback_chain
+from src.llm.rate_limiter import RateLimiter, RateLimitExceeded
+from src.llm.litellm_router import build_router, RouterClient, AsyncRouterClient
+from src.core.text_utils import estimate_tokens
+from src.core.config import (
+    LLM_MAX_CONCURRENT_REQUESTS,
+    HEDGE_ENABLED,
+    COMPLEXITY_ROUTING_ENABLED,
+    LLM_BACKEND,
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_MAX_WAIT,
+    PROXY_LOG_PATH,
+    PROXY_LOG_MAX_BYTES,
+    PROXY_LOG_BACKUPS,
+    PROXY_SUPERVISE_INTERVAL,
+    PROXY_UNHEALTHY_GRACE,
+    PROXY_RESTART_BACKOFF,
+    PROXY_MAX_BACKOFF,
+    PROXY_STABLE_UPTIME
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,42 +53,185 @@ env_path = Path(__file__).parent.parent.parent / "config" / ".env"
 load_dotenv(dotenv_path=env_path)
 
 LLM_PROXY_BASE_URL = "http://localhost:4000"
+LLM_CLIENT_TIMEOUT = 20.0
+
+
+class _AsyncState:
+    """Async client, concurrency limit and in-flight completions of one event loop"""
+    
+    def __init__(self, client):
+        self.client = client
+        self.semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENT_REQUESTS)
+        self.inflight: Dict[str, asyncio.Future] = {}
+
+
+class ProxySupervisor:
+    """
+    Owns the litellm proxy process: drains its output and restarts it when it fails
+    
+    stdout/stderr are merged and read continuously on a daemon thread into a rotating
+    log file, so a full OS pipe buffer can never block the proxy. A watcher thread
+    restarts the process (with exponential back-off) when it exits or has failed
+    its liveness probe for PROXY_UNHEALTHY_GRACE seconds. Upstream model errors
+    never restart it; they are the circuit breaker's concern.
+    """
+    
+    def __init__(self, cmd: List[str], health: ProxyHealthMonitor, log_path: str = PROXY_LOG_PATH):
+        self.cmd = cmd
+        self.health = health
+        self.process: Optional[subprocess.Popen] = None
+        self.started_at: Optional[float] = None
+        self.restarts = 0
+        self.last_exit_code: Optional[int] = None
+        self._last_healthy = 0.0
+        self._tail = deque(maxlen=50)  # Recent output lines, for startup errors
+        self._log = _proxy_output_logger(log_path)
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+    
+    def launch(self) -> subprocess.Popen:
+        """Start the process and its output drain"""
+        process = subprocess.Popen(
+            self.cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            errors="replace",  # A stray undecodable byte must not stop the drain
+            bufsize=1
+        )
+        self.process = process
+        self.started_at = self._last_healthy = time.monotonic()
+        threading.Thread(target=self._drain, args=(process,), name="llm-proxy-log", daemon=True).start()
+        logger.info(f"🚀 LLM proxy process started (PID: {process.pid})")
+        return process
+    
+    def _drain(self, process: subprocess.Popen):
+        """Copy proxy output to the log until the process closes it"""
+        try:
+            for line in process.stdout:
+                line = line.rstrip()
+                self._tail.append(line)
+                self._log.info(line)
+        except (OSError, ValueError) as e:
+            if process.poll() is None:
+                # Nothing reads the pipe any more: the proxy will block once it fills
+                logger.error(f"❌ LLM proxy output drain stopped while the proxy is running: {e}")
+        finally:
+            process.stdout.close()
+    
+    def tail(self, lines: int = 20) -> str:
+        """Last lines of proxy output"""
+        return "\n".join(list(self._tail)[-lines:])
+    
+    def start_watching(self):
+        """Start auto-restart supervision (idempotent)"""
+        if self._watcher and self._watcher.is_alive():
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="llm-proxy-supervisor", daemon=True)
+        self._watcher.start()
+    
+    def _watch(self):
+        backoff = PROXY_RESTART_BACKOFF
+        while not self._stop.wait(PROXY_SUPERVISE_INTERVAL):
+            now = time.monotonic()
+            # The monitor polls the liveness endpoint: the process is serving, whatever its models do
+            if self.health.healthy:
+                self._last_healthy = now
+            
+            exit_code = self.process.poll()
+            if exit_code is not None:
+                self.last_exit_code = exit_code
+                reason = f"exited with code {exit_code}"
+            elif now - self._last_healthy > PROXY_UNHEALTHY_GRACE and not self.health.check():
+                # Confirmed with a fresh probe, not just the monitor's last result
+                reason = f"not responding for {now - self._last_healthy:.0f}s"
+            else:
+                if now - self.started_at >= PROXY_STABLE_UPTIME:
+                    backoff = PROXY_RESTART_BACKOFF
+                continue
+            
+            logger.warning(f"⚠️  LLM proxy {reason}, restarting in {backoff:.0f}s")
+            if self._stop.wait(backoff):
+                break
+            _terminate(self.process)
+            self.restarts += 1
+            try:
+                self.launch()
+            except Exception as e:
+                logger.error(f"❌ Failed to restart LLM proxy: {e}")
+            backoff = min(backoff * 2, PROXY_MAX_BACKOFF)
+    
+    def stop(self):
+        """Stop supervision and terminate the process"""
+        self._stop.set()
+        if self.process:
+            _terminate(self.process)
+    
+    def running(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+    
+    def stats(self) -> Dict:
+        """Process state for the app: pid, uptime (s), restart count, last exit code"""
+        running = self.running()
+        return {
+            'running': running,
+            'pid': self.process.pid if self.process else None,
+            'uptime': time.monotonic() - self.started_at if running else 0.0,
+            'restarts': self.restarts,
+            'last_exit_code': self.last_exit_code,
+        }
+
 
 class LLMProxyManager:
     """Manages LiteLLM proxy for answer generation with fallback support"""
     
-    def __init__(self, config_path: str = "config/llm_proxy_config.yaml", port: int = 4000):
+    def __init__(self, config_path: str = "config/llm_proxy_config.yaml", port: int = 4000,
+                 backend: str = LLM_BACKEND):
         self.config_path = Path(config_path)
         self.port = port
+        self.backend = backend  # "proxy" (litellm server subprocess) or "router" (in-process)
         self.base_url = f"http://localhost:{port}"
         self.client: Optional[openai.OpenAI] = None
-        self.proxy_process = None
-        self._proxy_pid = None  # Track our own process only
+        self.router = None
+        self.supervisor: Optional[ProxySupervisor] = None  # Only for a proxy process we started
+        self.health = ProxyHealthMonitor(self.base_url, on_change=self._on_health_change)
+        self.breaker = CircuitBreaker()
+        self._async_states = weakref.WeakKeyDictionary()  # event loop -> _AsyncState
+        # Primary model + the proxy's fallbacks, the candidates for hedged requests
+        proxy_config = self.config_path if self.config_path.exists() else None
+        self.model_chain = get_fallback_chain("rag-llm", proxy_config)
+        self.latency = LatencyTracker()
+        self.rate_limiter = RateLimiter(proxy_config)
+        self.prompt_cache = PromptCacheStats()
+        self.complexity_router = ComplexityRouter(proxy_config)
         
+    @property
+    def proxy_process(self) -> Optional[subprocess.Popen]:
+        """Current proxy process (changes when the supervisor restarts it)"""
+        return self.supervisor.process if self.supervisor else None
+    
     def _kill_existing_processes(self):
         """Kill only OUR litellm process (safer approach)"""
-        if self._proxy_pid:
-            try:
-                import psutil
-                proc = psutil.Process(self._proxy_pid)
-                logger.info(f"Killing our litellm process (PID: {self._proxy_pid})")
-                proc.kill()
-                proc.wait(timeout=3)
-                self._proxy_pid = None
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-            except Exception as e:
-                logger.warning(f"Error killing process: {e}")
+        if self.supervisor:
+            logger.info(f"Killing our litellm process (PID: {self.proxy_process.pid})")
+            self.supervisor.stop()
+            self.supervisor = None
         
         time.sleep(1)  # Brief wait
     
     def start_proxy(self) -> bool:
         """Start LiteLLM proxy server with fast startup (max 10s)"""
+        if self.backend == "router":
+            return self.start_router()
+        
         try:
             # Quick health check (1 retry, 2s timeout)
             if self._check_proxy_health(max_retries=1, timeout=2):
                 logger.info(f"✅ LLM proxy already running on port {self.port}")
                 self._initialize_client()
+                self.health.start()
                 return True
             
             if not self.config_path.exists():
@@ -76,15 +252,9 @@ class LLMProxyManager:
             
             logger.info(f"Running command: {' '.join(cmd)}")
             
-            # Start process and track PID
-            self.proxy_process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1
-            )
-            self._proxy_pid = self.proxy_process.pid
+            # Start process under supervision (output drained to a rotating log)
+            self.supervisor = ProxySupervisor(cmd, self.health)
+            self.supervisor.launch()
             
             # FAST STARTUP: Max 10 seconds (5 retries × 2 seconds)
             logger.info("⏳ Waiting for proxy to start (max 10 seconds)...")
@@ -92,9 +262,9 @@ class LLMProxyManager:
             for i in range(max_retries):
                 # Check if process died
                 if self.proxy_process.poll() is not None:
-                    stdout, stderr = self.proxy_process.communicate()
+                    time.sleep(0.2)  # Let the drain thread read the last lines
                     logger.error(f"❌ Proxy process died")
-                    logger.error(f"STDERR:\n{stderr[:500]}")
+                    logger.error(f"OUTPUT:\n{self.supervisor.tail()}")
                     return False
                 
                 time.sleep(2)
@@ -105,19 +275,16 @@ class LLMProxyManager:
                     logger.info(f"   🤖 Primary: Groq (llama3-8b)")
                     logger.info(f"   🔄 Fallbacks: Ollama Cloud models")
                     self._initialize_client()
+                    self.health.start()
+                    self.supervisor.start_watching()
                     return True
                 
                 if i == max_retries - 1:
                     logger.error("❌ Startup timeout (10s)")
             
             # Get error output
-            if self.proxy_process:
-                try:
-                    stdout, stderr = self.proxy_process.communicate(timeout=2)
-                    if stderr:
-                        logger.error(f"STDERR:\n{stderr[:500]}")
-                except:
-                    pass
+            if self.supervisor:
+                logger.error(f"OUTPUT:\n{self.supervisor.tail()}")
             
             return False
             
@@ -127,24 +294,36 @@ class LLMProxyManager:
             logger.error(traceback.format_exc())
             return False
     
+    def start_router(self) -> bool:
+        """Build the in-process LiteLLM Router (no server, no startup polling)"""
+        try:
+            self.router = build_router(self.config_path if self.config_path.exists() else None)
+            self.client = RouterClient(self.router, timeout=LLM_CLIENT_TIMEOUT, num_retries=1)
+            return True
+        except ImportError:
+            logger.error("❌ litellm is not installed - cannot use the in-process router")
+        except Exception as e:
+            logger.error(f"❌ Failed to build LiteLLM Router: {e}")
+        self.router = None
+        self.client = None
+        return False
+    
     def _check_proxy_health(self, max_retries=1, timeout=2) -> bool:
-        """Quick health check with configurable retries"""
+        """Active health check with configurable retries (also refreshes the monitor's cached state)"""
         for attempt in range(max_retries):
-            try:
-                endpoint = f"http://localhost:{self.port}/health"
-                response = requests.get(endpoint, timeout=timeout)
-                if response.status_code == 200:
-                    return True
-            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
-                pass
-            except Exception:
-                pass
+            if self.health.check(timeout=timeout):
+                return True
             
             if attempt < max_retries - 1:
                 time.sleep(0.5)
         
         return False
     
+    def _on_health_change(self, healthy: bool):
+        """Connect as soon as the monitor sees a proxy that came up after startup"""
+        if healthy and self.client is None:
+            self._initialize_client()
+    
     def _initialize_client(self):
         """Initialize OpenAI client with CORRECT timeout placement"""
         try:
@@ -152,7 +331,7 @@ class LLMProxyManager:
             self.client = openai.OpenAI(
                 api_key="dummy-key",
                 base_url=self.base_url,
-                timeout=20.0,  # This is correct - client-level timeout
+                timeout=LLM_CLIENT_TIMEOUT,  # This is correct - client-level timeout
                 max_retries=1
             )
             logger.info("✅ OpenAI client initialized for LLM proxy")
@@ -161,140 +340,447 @@ class LLMProxyManager:
             self.client = None
     
     def _is_proxy_alive(self) -> bool:
-        """Runtime check: Is proxy actually alive RIGHT NOW?"""
+        """Runtime check from cached state (no network call): process running, healthy, circuit closed"""
+        if self.router is not None:
+            return self.breaker.allow_request()  # In-process: only provider failures matter
+        
         # Check process is still running
         if self.proxy_process and self.proxy_process.poll() is not None:
             logger.warning("Proxy process died")
             return False
         
-        # Quick health check
-        return self._check_proxy_health(max_retries=1, timeout=2)
+        # Kept current by the background health monitor; the breaker fails fast after repeated errors
+        return self.health.healthy and self.breaker.allow_request()
     
     def generate_answer(
         self,
         question: str,
         context: str,
         is_arabic: bool = False,
-        chat_history: List[Dict] = None,
+        chat_history: History = None,
         max_tokens: int = 500,
-        temperature: float = 0.3
+        temperature: float = 0.3,
+        timer: Optional[StageTimer] = None,
+        deadline: Optional[Deadline] = None,
+        complexity: Optional[float] = None
     ) -> str:
-        """Generate answer with RUNTIME health check"""
+        """
+        Generate answer with RUNTIME health check (bounded by the request deadline, if any)
+        
+        With a complexity score (see complexity_router.score_complexity), the model
+        tier's model and max_tokens replace the defaults.
+        """
+        if deadline is not None and deadline.expired():
+            logger.warning("Request deadline exceeded before generation, using fallback")
+            return self._fallback_answer(question, context, is_arabic, timer)
+        
         # CRITICAL: Check if proxy is ACTUALLY alive before each call
-        if not self.client or not self._is_proxy_alive():
+        with timed(timer, "proxy_health_check"):
+            proxy_alive = bool(self.client) and self._is_proxy_alive()
+        if not proxy_alive:
             logger.warning("LLM proxy not available, using fallback")
-            return self._fallback_answer(question, context, is_arabic)
+            return self._fallback_answer(question, context, is_arabic, timer)
+        
+        tier, models, max_tokens = self._route(complexity, max_tokens)
         
         try:
-            # Format chat history
-            history_context = ""
-            if chat_history and len(chat_history) > 0:
-                recent_history = chat_history[-8:] if len(chat_history) > 8 else chat_history
-                
-                if is_arabic:
-                    history_context = "\n\nالمحادثة السابقة:\n"
-                    for msg in recent_history:
-                        role = "المستخدم" if msg['role'] == 'user' else "المساعد"
-                        history_context += f"{role}: {msg['content']}\n"
-                else:
-                    history_context = "\n\nPrevious conversation:\n"
-                    for msg in recent_history:
-                        role = "User" if msg['role'] == 'user' else "Assistant"
-                        history_context += f"{role}: {msg['content']}\n"
+            with timed(timer, "prompt_build"):
+                prompt = build_prompt(question, context, is_arabic, chat_history)
             
-            # Create prompt
-            if is_arabic:
-                system_prompt = """أنت مساعد ذكي متخصص في تحليل تقارير صندوق الاستثمارات العامة السعودي (PIF).
-مهمتك هي تقديم إجابات دقيقة ومفصلة بناءً على السياق المقدم من التقارير السنوية.
-
-قواعد الإجابة:
-1. استخدم المعلومات من السياق المقدم فقط
-2. راعِ المحادثة السابقة لفهم السياق الكامل
-3. قدم إجابات واضحة ومنظمة
-4. اذكر الأرقام والإحصائيات عند توفرها
-5. إذا كانت المعلومات غير كافية، اذكر ذلك بوضوح
-6. لا تختلق معلومات غير موجودة في السياق"""
-
-                user_prompt = f"""السياق من تقارير صندوق الاستثمارات العامة:
-{context}
-{history_context}
-
-السؤال الحالي: {question}
-
-قدم إجابة شاملة ودقيقة بناءً على السياق والمحادثة السابقة. استخدم تنسيق واضح مع نقاط منظمة عند الضرورة."""
-
-            else:
-                system_prompt = """You are an intelligent assistant specialized in analyzing Saudi Arabia's Public Investment Fund (PIF) annual reports.
-Your task is to provide accurate and detailed answers based on the provided context from annual reports.
-
-Answer Guidelines:
-1. Use only information from the provided context
-2. Consider previous conversation for full context understanding
-3. Provide clear and well-structured answers
-4. Include numbers and statistics when available
-5. If information is insufficient, state it clearly
-6. Do not fabricate information not in the context"""
-
-                user_prompt = f"""Context from PIF Annual Reports:
-{context}
-{history_context}
-
-Current Question: {question}
-
-Provide a comprehensive and accurate answer based on the context and previous conversation. Use clear formatting with organized bullet points when necessary."""
-
             # CORRECT: timeout is in client init, NOT here
             try:
-                response = self.client.chat.completions.create(
-                    model="rag-llm",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    temperature=temperature,
-                    max_tokens=max_tokens
-                    # REMOVED: timeout=20.0 (incorrect - not an OpenAI field)
-                )
+                with timed(timer, "rate_limit"):
+                    model = self._acquire_model(prompt.system + prompt.user, max_tokens, deadline, models)
+                
+                # Under a deadline, one attempt capped at the remaining budget
+                client = self.client
+                if deadline is not None:
+                    client = self.client.with_options(timeout=deadline.timeout(LLM_CLIENT_TIMEOUT), max_retries=0)
+                
+                started = time.monotonic()
+                with timed(timer, "llm_call"):
+                    response = client.chat.completions.create(
+                        model=model,
+                        messages=prompt.messages(),
+                        temperature=temperature,
+                        max_tokens=max_tokens
+                        # REMOVED: timeout=20.0 (incorrect - not an OpenAI field)
+                    )
                 
                 answer = response.choices[0].message.content.strip()
+                self.latency.record(model, time.monotonic() - started)
+                if tier:
+                    self.complexity_router.record(tier, time.monotonic() - started)
+                self.prompt_cache.record(prompt.prefix_hash, getattr(response, 'usage', None))
+                self.breaker.record_success()
                 logger.info(f"✅ Generated answer using: {response.model}")
                 return answer
                 
+            except RateLimitExceeded as e:
+                logger.warning(f"{e}, using fallback")
+                self.breaker.release_probe()  # Never reached the proxy - not a health signal
+                return self._fallback_answer(question, context, is_arabic, timer)
             except openai.APITimeoutError:
                 logger.error("API timeout")
-                return self._fallback_answer(question, context, is_arabic)
+                self.breaker.record_failure()
+                return self._fallback_answer(question, context, is_arabic, timer)
             except openai.APIConnectionError as e:
                 logger.error(f"Connection error: {e}")
-                return self._fallback_answer(question, context, is_arabic)
+                self.breaker.record_failure()
+                return self._fallback_answer(question, context, is_arabic, timer)
             except openai.BadRequestError as e:
                 logger.error(f"Bad request: {e}")
-                return self._fallback_answer(question, context, is_arabic)
+                self.breaker.record_success()  # The proxy answered - not a health failure
+                return self._fallback_answer(question, context, is_arabic, timer)
                 
         except Exception as e:
             logger.error(f"Error generating answer: {e}")
-            return self._fallback_answer(question, context, is_arabic)
+            self.breaker.record_failure()
+            return self._fallback_answer(question, context, is_arabic, timer)
     
-    def _fallback_answer(self, question: str, context: str, is_arabic: bool) -> str:
-        """Fallback answer when LLM is unavailable"""
-        if is_arabic:
-            intro = "بناءً على المعلومات المتاحة في تقارير صندوق الاستثمارات العامة:\n\n"
+    def _route(self, complexity: Optional[float], max_tokens: int) -> Tuple[Optional[ModelTier], List[str], int]:
+        """
+        Tier, model chain and output cap for a request; defaults without a score
+        
+        A tier's chain is its model followed by that model's own proxy fallbacks, so
+        whichever alias is called by name still falls back on the proxy side.
+        """
+        tier = None
+        if complexity is not None and COMPLEXITY_ROUTING_ENABLED:
+            tier = self.complexity_router.select(complexity)
+        if tier is None:
+            return None, self.model_chain, max_tokens
+        
+        logger.info(f"🧭 Complexity {complexity:.2f} -> {tier.name} tier ({tier.model}, max_tokens={tier.max_tokens})")
+        return tier, self.complexity_router.chains[tier.name], tier.max_tokens
+    
+    def _acquire_model(self, prompt: str, max_tokens: int, deadline: Optional[Deadline] = None,
+                       models: Optional[List[str]] = None) -> str:
+        """
+        Model alias to call, after waiting for rate-limit capacity
+        
+        Prefers the first model (primary); moves to a fallback with spare rpm/tpm when it
+        is saturated. Raises RateLimitExceeded if nothing frees up within the wait limit.
+        """
+        models = models or self.model_chain
+        if not RATE_LIMIT_ENABLED:
+            return models[0]
+        max_wait = deadline.timeout(RATE_LIMIT_MAX_WAIT) if deadline is not None else None
+        return self.rate_limiter.acquire(models, estimate_tokens(prompt) + max_tokens, max_wait)
+    
+    def _async_state(self) -> _AsyncState:
+        """Async state of the running event loop (async clients are bound to their loop)"""
+        loop = asyncio.get_running_loop()
+        state = self._async_states.get(loop)
+        if state is None:
+            if self.router is not None:
+                client = AsyncRouterClient(self.router, timeout=LLM_CLIENT_TIMEOUT, num_retries=1)
+            else:
+                client = openai.AsyncOpenAI(
+                    api_key="dummy-key",
+                    base_url=self.base_url,
+                    timeout=LLM_CLIENT_TIMEOUT,
+                    max_retries=1
+                )
+            state = _AsyncState(client)
+            self._async_states[loop] = state
+        return state
+    
+    async def generate_answer_async(
+        self,
+        question: str,
+        context: str,
+        is_arabic: bool = False,
+        chat_history: History = None,
+        max_tokens: int = 500,
+        temperature: float = 0.3,
+        timer: Optional[StageTimer] = None,
+        deadline: Optional[Deadline] = None,
+        complexity: Optional[float] = None
+    ) -> str:
+        """
+        Async generate_answer with single-flight coalescing
+        
+        Requests with the same (model, prompt hash, params) key wait on the completion
+        already in flight instead of calling the proxy again; every waiter gets its
+        result. At most LLM_MAX_CONCURRENT_REQUESTS completions run at once per loop.
+        """
+        if deadline is not None and deadline.expired():
+            logger.warning("Request deadline exceeded before generation, using fallback")
+            return self._fallback_answer(question, context, is_arabic, timer)
+        
+        with timed(timer, "proxy_health_check"):
+            proxy_alive = bool(self.client) and self._is_proxy_alive()
+        if not proxy_alive:
+            logger.warning("LLM proxy not available, using fallback")
+            return self._fallback_answer(question, context, is_arabic, timer)
+        
+        tier, models, max_tokens = self._route(complexity, max_tokens)
+        
+        with timed(timer, "prompt_build"):
+            prompt = build_prompt(question, context, is_arabic, chat_history)
+            messages = prompt.messages()
+        
+        state = self._async_state()
+        key = _request_key(models[0], messages, temperature=temperature, max_tokens=max_tokens)
+        completion = state.inflight.get(key)
+        if completion is None:
+            timeout = deadline.timeout(LLM_CLIENT_TIMEOUT) if deadline is not None else None
+            completion = asyncio.ensure_future(self._complete_async(
+                state, messages, temperature, max_tokens,
+                timeout=timeout, prefix_hash=prompt.prefix_hash, models=models, tier=tier
+            ))
+            state.inflight[key] = completion
+            completion.add_done_callback(lambda done: _release_inflight(state.inflight, key, done))
         else:
-            intro = "Based on the PIF annual reports:\n\n"
+            logger.info("🔗 Joined in-flight LLM request")
+        
+        try:
+            # shield: a waiter that times out or is cancelled leaves the shared call running
+            with timed(timer, "llm_call"):
+                if deadline is not None:
+                    return await asyncio.wait_for(asyncio.shield(completion), deadline.timeout(LLM_CLIENT_TIMEOUT))
+                return await asyncio.shield(completion)
+        except (asyncio.TimeoutError, openai.APITimeoutError):
+            logger.error("API timeout")
+        except openai.APIConnectionError as e:
+            logger.error(f"Connection error: {e}")
+        except openai.BadRequestError as e:
+            logger.error(f"Bad request: {e}")
+        except Exception as e:
+            logger.error(f"Error generating answer: {e}")
+        return self._fallback_answer(question, context, is_arabic, timer)
+    
+    async def _complete_async(self, state: _AsyncState, messages: List[Dict], temperature: float,
+                              max_tokens: int, timeout: Optional[float] = None,
+                              prefix_hash: Optional[str] = None, models: Optional[List[str]] = None,
+                              tier: Optional[ModelTier] = None) -> str:
+        """
+        One proxy completion, shared by every waiter on its key (records the breaker once)
+        
+        With HEDGE_ENABLED, a primary call that runs past its p95 latency is hedged
+        to the fastest fallback model; the first response wins.
+        """
+        client = state.client
+        if timeout is not None:
+            client = client.with_options(timeout=timeout, max_retries=0)
+        
+        tokens = sum(estimate_tokens(message["content"]) for message in messages) + max_tokens
+        max_wait = min(timeout, RATE_LIMIT_MAX_WAIT) if timeout is not None else None
+        
+        async def create(model: str):
+            if RATE_LIMIT_ENABLED:
+                await self.rate_limiter.acquire_async([model], tokens, max_wait)
+            return await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+        
+        # Models with spare rpm/tpm capacity go first
+        models = models or self.model_chain
+        if RATE_LIMIT_ENABLED:
+            models = self.rate_limiter.order_by_capacity(models, tokens)
+        
+        async with state.semaphore:
+            started = time.monotonic()
+            try:
+                if HEDGE_ENABLED and len(models) > 1:
+                    response, _ = await hedged_call(create, models, self.latency)
+                else:
+                    response = await create(models[0])
+            except RateLimitExceeded:
+                self.breaker.release_probe()  # Never reached the proxy - not a health signal
+                raise
+            except openai.BadRequestError:
+                self.breaker.record_success()  # The proxy answered - not a health failure
+                raise
+            except Exception:
+                self.breaker.record_failure()
+                raise
         
-        return intro + context[:800] + "..."
+        self.breaker.record_success()
+        if tier:
+            self.complexity_router.record(tier, time.monotonic() - started)
+        if prefix_hash:
+            self.prompt_cache.record(prefix_hash, getattr(response, 'usage', None))
+        logger.info(f"✅ Generated answer using: {response.model}")
+        return response.choices[0].message.content.strip()
+    
+    def generate_answer_shared(self, *args, **kwargs) -> str:
+        """
+        Blocking generate_answer_async on the shared event loop
+        
+        Sync callers (Streamlit sessions, batch workers) all submit to one loop, so
+        their identical requests coalesce and share one concurrency limit.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self.generate_answer_async(*args, **kwargs), _shared_event_loop()
+        )
+        return future.result()
+    
+    def generate_answer_stream(
+        self,
+        question: str,
+        context: str,
+        is_arabic: bool = False,
+        chat_history: History = None,
+        max_tokens: int = 500,
+        temperature: float = 0.3,
+        timer: Optional[StageTimer] = None,
+        deadline: Optional[Deadline] = None,
+        complexity: Optional[float] = None
+    ) -> Iterator[str]:
+        """
+        Stream the answer as text pieces while the LLM generates it
+        
+        Falls back to the context answer (as a single piece) when the proxy is down
+        or the call fails before the first token. A stream that fails midway, or runs
+        past the request deadline, ends early with the text received so far.
+        """
+        if deadline is not None and deadline.expired():
+            logger.warning("Request deadline exceeded before generation, using fallback")
+            yield self._fallback_answer(question, context, is_arabic, timer)
+            return
+        
+        with timed(timer, "proxy_health_check"):
+            proxy_alive = bool(self.client) and self._is_proxy_alive()
+        if not proxy_alive:
+            logger.warning("LLM proxy not available, using fallback")
+            yield self._fallback_answer(question, context, is_arabic, timer)
+            return
+        
+        tier, models, max_tokens = self._route(complexity, max_tokens)
+        
+        with timed(timer, "prompt_build"):
+            prompt = build_prompt(question, context, is_arabic, chat_history)
+        
+        try:
+            with timed(timer, "rate_limit"):
+                model = self._acquire_model(prompt.system + prompt.user, max_tokens, deadline, models)
+        except RateLimitExceeded as e:
+            logger.warning(f"{e}, using fallback")
+            self.breaker.release_probe()  # Never reached the proxy - not a health signal
+            yield self._fallback_answer(question, context, is_arabic, timer)
+            return
+        
+        client = self.client
+        if deadline is not None:
+            client = self.client.with_options(timeout=deadline.timeout(LLM_CLIENT_TIMEOUT), max_retries=0)
+        
+        stream = None
+        started = False
+        call_started = time.monotonic()
+        try:
+            # Time to first token is what the user waits for
+            with timed(timer, "llm_first_token"):
+                stream = client.chat.completions.create(
+                    model=model,
+                    messages=prompt.messages(),
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True
+                )
+                pieces = (_delta_text(chunk) for chunk in stream)
+                first = next((piece for piece in pieces if piece), None)
+            
+            self.breaker.record_success()
+            self.prompt_cache.record(prompt.prefix_hash)  # Streams carry no usage block
+            if first is None:
+                logger.warning("LLM stream returned no content, using fallback")
+                yield self._fallback_answer(question, context, is_arabic, timer)
+                return
+            
+            started = True
+            yield first
+            with timed(timer, "llm_stream"):
+                for piece in pieces:
+                    if deadline is not None and deadline.expired():
+                        logger.warning("Request deadline exceeded while streaming, answer truncated")
+                        break
+                    if piece:
+                        yield piece
+            if tier:
+                self.complexity_router.record(tier, time.monotonic() - call_started)
+            logger.info("✅ Streamed answer from LLM proxy")
+        
+        except Exception as e:
+            logger.error(f"Error streaming answer: {e}")
+            self.breaker.record_failure()
+            if not started:
+                yield self._fallback_answer(question, context, is_arabic, timer)
+        finally:
+            # Release the HTTP connection even if the consumer stops early
+            if stream is not None and hasattr(stream, 'close'):
+                stream.close()
+    
+    def summarize(self, text: str, max_tokens: int = 300) -> Optional[str]:
+        """Summarize report text in its own language (None if the proxy is unavailable)"""
+        if not self.client or not self._is_proxy_alive():
+            return None
+        
+        try:
+            model = self._acquire_model(text, max_tokens)
+        except RateLimitExceeded as e:
+            logger.warning(f"{e}, skipping summary")
+            self.breaker.release_probe()  # Never reached the proxy - not a health signal
+            return None
+        
+        try:
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": "You summarize sections of Saudi Arabia's Public Investment Fund (PIF) annual reports. "
+                                                  "Write a concise factual summary in the same language as the text. "
+                                                  "Keep key figures, years and named programs. Do not add information."},
+                    {"role": "user", "content": text}
+                ],
+                temperature=0.0,
+                max_tokens=max_tokens
+            )
+            self.breaker.record_success()
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            logger.error(f"Error summarizing text: {e}")
+            self.breaker.record_failure()
+            return None
+    
+    def _fallback_answer(self, question: str, context: str, is_arabic: bool,
+                         timer: Optional[StageTimer] = None) -> str:
+        """Fallback answer when LLM is unavailable"""
+        with timed(timer, "fallback"):
+            if is_arabic:
+                intro = "بناءً على المعلومات المتاحة في تقارير صندوق الاستثمارات العامة:\n\n"
+            else:
+                intro = "Based on the PIF annual reports:\n\n"
+            
+            return intro + context[:800] + "..."
     
     def stop_proxy(self):
         """Stop the LLM proxy server"""
-        if self.proxy_process:
-            try:
-                self.proxy_process.terminate()
-                self.proxy_process.wait(timeout=5)
-                logger.info("✅ LLM proxy stopped")
-            except:
-                self.proxy_process.kill()
-            finally:
-                self.client = None
-                self._proxy_pid = None
+        if self.router is not None:
+            self.router = None
+            self.client = None
+            self._async_states.clear()
+        if self.supervisor:
+            self.supervisor.stop()
+            self.supervisor = None
+            self.client = None
+            logger.info("✅ LLM proxy stopped")
+    
+    def proxy_stats(self) -> Dict:
+        """Backend, health, circuit, prompt-cache and tier stats, plus process uptime/restarts when we supervise the proxy"""
+        stats = {
+            'backend': self.backend,
+            'healthy': self.router is not None or self.health.healthy,
+            'circuit': self.breaker.state,
+        }
+        if self.supervisor:
+            stats.update(self.supervisor.stats())
+        stats['prompt_cache'] = self.prompt_cache.snapshot()
+        stats['tiers'] = self.complexity_router.stats()
+        return stats
     
     def __enter__(self):
         """Context manager entry"""
@@ -306,6 +792,67 @@ Provide a comprehensive and accurate answer based on the context and previous co
         self.stop_proxy()
 
 
+def _proxy_output_logger(log_path: str) -> logging.Logger:
+    """Logger writing proxy output to a size-rotated file (not propagated to the app log)"""
+    output_logger = logging.getLogger("llm_proxy.output")
+    if not output_logger.handlers:
+        Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            log_path, maxBytes=PROXY_LOG_MAX_BYTES, backupCount=PROXY_LOG_BACKUPS, encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        output_logger.addHandler(handler)
+        output_logger.setLevel(logging.INFO)
+        output_logger.propagate = False
+    return output_logger
+
+
+def _terminate(process: subprocess.Popen, timeout: float = 5):
+    """Terminate a process, killing it if it does not exit in time"""
+    if process.poll() is not None:
+        return
+    try:
+        process.terminate()
+        process.wait(timeout=timeout)
+    except Exception:
+        process.kill()
+
+
+def _delta_text(chunk) -> Optional[str]:
+    """Text content of one streamed completion chunk"""
+    if not chunk.choices:
+        return None
+    return chunk.choices[0].delta.content
+
+
+def _request_key(model: str, messages: List[Dict], **params) -> str:
+    """Coalescing key: model, hash of the prompts and the sampling parameters"""
+    payload = json.dumps({"model": model, "messages": messages, "params": params},
+                         ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _release_inflight(inflight: Dict[str, asyncio.Future], key: str, completion: asyncio.Future):
+    """Forget a finished completion so later requests make a fresh call"""
+    if inflight.get(key) is completion:
+        del inflight[key]
+    if not completion.cancelled():
+        completion.exception()  # Retrieved here so unawaited failures are not logged as "never retrieved"
+
+
+# Event loop on a daemon thread shared by all sync callers of generate_answer_shared
+_async_loop: Optional[asyncio.AbstractEventLoop] = None
+_async_loop_lock = threading.Lock()
+
+def _shared_event_loop() -> asyncio.AbstractEventLoop:
+    global _async_loop
+    with _async_loop_lock:
+        if _async_loop is None:
+            _async_loop = asyncio.new_event_loop()
+            threading.Thread(target=_async_loop.run_forever, name="llm-async", daemon=True).start()
+    return _async_loop
+
+
 # Global proxy instance (singleton pattern)
 _proxy_instance: Optional[LLMProxyManager] = None
 
@@ -315,14 +862,22 @@ def get_llm_proxy() -> LLMProxyManager:
     if _proxy_instance is None:
         _proxy_instance = LLMProxyManager()
         
+        if _proxy_instance.backend == "router":
+            if not _proxy_instance.start_router():
+                logger.warning("⚠️  LiteLLM Router not available - will use context fallback")
+            return _proxy_instance
+        
         # FAST check: 1 retry, 2 second timeout
         logger.info("🔍 Checking for LLM proxy...")
         
+        # The health monitor initializes the client when the proxy is (or becomes) healthy
         if _proxy_instance._check_proxy_health(max_retries=1, timeout=2):
-            _proxy_instance._initialize_client()
             logger.info("✅ Connected to LLM proxy")
         else:
             logger.warning("⚠️  LLM proxy not available - will use context fallback")
             logger.warning("   Start proxy: python scripts/start_llm_proxy.py")
+        
+        # Keep proxy state current in the background (requests read it without probing)
+        _proxy_instance.health.start()
             
     return _proxy_instance
\ No newline at end of file
@@ -0,0 +1,244 @@
+"""
+Local OpenAI-compatible mock LLM server for offline load and latency testing
+Speaks /v1/chat/completions (streaming and non-streaming) and /health, with
+seeded latency distributions, token rates and error/429 injection per model
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Iterator, Optional
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MockBehavior:
+    """
+    How the mock answers one model (or all models)
+
+    latency: "fixed" (always latency_mean), "uniform" (mean ± spread),
+    "normal" (mean, stddev spread) or "lognormal" (median mean, sigma spread).
+    It is the delay before the first token; streamed tokens then arrive at tokens_per_second.
+    """
+    latency: str = "fixed"
+    latency_mean: float = 0.05
+    latency_spread: float = 0.0
+    tokens_per_second: float = 0.0  # 0 = all tokens at once
+    error_rate: float = 0.0  # Fraction of requests answered with HTTP 500
+    rate_limit_rate: float = 0.0  # Fraction of requests answered with HTTP 429
+    response_text: Optional[str] = None  # Default: a deterministic answer echoing the question
+
+    def sample_latency(self, rng: random.Random) -> float:
+        if self.latency == "uniform":
+            value = rng.uniform(self.latency_mean - self.latency_spread, self.latency_mean + self.latency_spread)
+        elif self.latency == "normal":
+            value = rng.gauss(self.latency_mean, self.latency_spread)
+        elif self.latency == "lognormal":
+            value = rng.lognormvariate(0.0, self.latency_spread) * self.latency_mean
+        else:
+            value = self.latency_mean
+        return max(value, 0.0)
+
+
+@dataclass
+class MockStats:
+    requests: Dict[str, int] = field(default_factory=dict)  # model -> requests
+    statuses: Dict[int, int] = field(default_factory=dict)  # HTTP status -> responses
+
+
+class MockLLMServer:
+    """
+    Threaded mock server; `models` overrides the default behavior per model alias
+
+    Random draws come from one seeded generator, so a run with the same seed and
+    request order injects the same latencies and errors.
+    """
+
+    def __init__(self, behavior: Optional[MockBehavior] = None, models: Optional[Dict[str, MockBehavior]] = None,
+                 port: int = 0, seed: int = 0, healthy: bool = True):
+        self.behavior = behavior or MockBehavior()
+        self.models = models or {}
+        self.healthy = healthy
+        self.stats = MockStats()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-llm", daemon=True)
+        self._thread.start()
+        logger.info(f"🧪 Mock LLM server on {self.base_url}")
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _plan(self, model: str):
+        """(behavior, status, latency) for one request, drawn under the lock for reproducibility"""
+        behavior = self.models.get(model, self.behavior)
+        with self._lock:
+            self.stats.requests[model] = self.stats.requests.get(model, 0) + 1
+            roll = self._rng.random()
+            latency = behavior.sample_latency(self._rng)
+        if roll < behavior.rate_limit_rate:
+            status = 429
+        elif roll < behavior.rate_limit_rate + behavior.error_rate:
+            status = 500
+        else:
+            status = 200
+        return behavior, status, latency
+
+    def _count_status(self, status: int):
+        with self._lock:
+            self.stats.statuses[status] = self.stats.statuses.get(status, 0) + 1
+
+
+def _answer_text(behavior: MockBehavior, messages) -> str:
+    if behavior.response_text is not None:
+        return behavior.response_text
+    question = messages[-1].get("content", "") if messages else ""
+    return f"Mock answer to: {question[-200:]}"
+
+
+def _tokens(text: str) -> Iterator[str]:
+    """Split text into word tokens that concatenate back to the text"""
+    words = text.split(" ")
+    for i, word in enumerate(words):
+        yield word if i == 0 else " " + word
+
+
+def _make_handler(server: MockLLMServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+            server._count_status(status)
+
+        def do_GET(self):
+            if self.path.rstrip("/") in ("/health", "/health/liveliness", "/health/readiness"):
+                status = 200 if server.healthy else 503
+                self._send_json(status, {"status": "healthy" if server.healthy else "unhealthy"})
+            else:
+                self._send_json(404, {"error": {"message": "not found"}})
+
+        def do_POST(self):
+            if self.path.rstrip("/") not in ("/v1/chat/completions", "/chat/completions"):
+                self._send_json(404, {"error": {"message": "not found"}})
+                return
+
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            model = request.get("model", "mock")
+            behavior, status, latency = server._plan(model)
+            time.sleep(latency)
+
+            if status == 429:
+                self._send_json(429, {"error": {"message": "Rate limit exceeded (mock)", "type": "rate_limit_error"}},
+                                headers={"Retry-After": "1"})
+                return
+            if status == 500:
+                self._send_json(500, {"error": {"message": "Injected error (mock)", "type": "server_error"}})
+                return
+
+            text = _answer_text(behavior, request.get("messages", []))
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+            if request.get("stream"):
+                self._stream(completion_id, model, text, behavior.tokens_per_second)
+                return
+
+            completion_tokens = len(list(_tokens(text)))
+            if behavior.tokens_per_second:
+                time.sleep(completion_tokens / behavior.tokens_per_second)
+            self._send_json(200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": text}}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": completion_tokens,
+                          "total_tokens": completion_tokens},
+            })
+
+        def _stream(self, completion_id: str, model: str, text: str, tokens_per_second: float):
+            """Server-sent events, one chunk per token, terminated by [DONE]"""
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            server._count_status(200)
+
+            def event(delta: Dict, finish_reason: Optional[str] = None):
+                chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                         "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+            try:
+                event({"role": "assistant", "content": ""})
+                for token in _tokens(text):
+                    if tokens_per_second:
+                        time.sleep(1.0 / tokens_per_second)
+                    event({"content": token})
+                event({}, finish_reason="stop")
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # Client cancelled the stream
+            self.close_connection = True
+
+    return Handler
+
+
+@contextmanager
+def mock_llm_proxy(behavior: Optional[MockBehavior] = None, models: Optional[Dict[str, MockBehavior]] = None,
+                   seed: int = 0):
+    """
+    Fixture: run a mock server and point get_llm_proxy() at it for the duration
+
+    Yields the MockLLMServer (its .stats show what the app sent). The previous
+    global LLMProxyManager is restored on exit.
+    """
+    from src.llm import llm_proxy
+
+    server = MockLLMServer(behavior, models, seed=seed).start()
+    previous = llm_proxy._proxy_instance
+    manager = llm_proxy.LLMProxyManager(port=server.port, backend="proxy")
+    manager._check_proxy_health(max_retries=1, timeout=2)  # Healthy -> client initialized
+    manager.health.start()
+    llm_proxy._proxy_instance = manager
+    try:
+        yield server
+    finally:
+        llm_proxy._proxy_instance = previous
+        manager.health.stop()
+        server.stop()
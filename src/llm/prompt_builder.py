@@ -0,0 +1,134 @@
+"""
+Answer prompts laid out for provider-side prefix caching
+
+Static parts (system prompt, instructions) come first and are module constants, so
+every request in a language starts with byte-identical text. Then comes the chat
+history, which grows append-mostly within a conversation, then the retrieved
+context, and the question last.
+"""
+
+from typing import Dict, List, NamedTuple
+import hashlib
+import threading
+
+from src.llm.history_manager import History, prepare_history
+
+SYSTEM_PROMPTS = {
+    'ar': """أنت مساعد ذكي متخصص في تحليل تقارير صندوق الاستثمارات العامة السعودي (PIF).
+مهمتك هي تقديم إجابات دقيقة ومفصلة بناءً على السياق المقدم من التقارير السنوية.
+
+قواعد الإجابة:
+1. استخدم المعلومات من السياق المقدم فقط
+2. راعِ المحادثة السابقة لفهم السياق الكامل
+3. قدم إجابات واضحة ومنظمة
+4. اذكر الأرقام والإحصائيات عند توفرها
+5. إذا كانت المعلومات غير كافية، اذكر ذلك بوضوح
+6. لا تختلق معلومات غير موجودة في السياق""",
+    'en': """You are an intelligent assistant specialized in analyzing Saudi Arabia's Public Investment Fund (PIF) annual reports.
+Your task is to provide accurate and detailed answers based on the provided context from annual reports.
+
+Answer Guidelines:
+1. Use only information from the provided context
+2. Consider previous conversation for full context understanding
+3. Provide clear and well-structured answers
+4. Include numbers and statistics when available
+5. If information is insufficient, state it clearly
+6. Do not fabricate information not in the context""",
+}
+
+INSTRUCTIONS = {
+    'ar': "قدم إجابة شاملة ودقيقة بناءً على السياق والمحادثة السابقة. استخدم تنسيق واضح مع نقاط منظمة عند الضرورة.",
+    'en': "Provide a comprehensive and accurate answer based on the context and previous conversation. "
+          "Use clear formatting with organized bullet points when necessary.",
+}
+
+_LABELS = {
+    'ar': {'history': "المحادثة السابقة:", 'summary': "ملخص ما سبق:", 'user': "المستخدم", 'assistant': "المساعد",
+           'context': "السياق من تقارير صندوق الاستثمارات العامة:", 'question': "السؤال الحالي:"},
+    'en': {'history': "Previous conversation:", 'summary': "Summary of earlier turns:", 'user': "User",
+           'assistant': "Assistant", 'context': "Context from PIF Annual Reports:", 'question': "Current Question:"},
+}
+
+
+class PromptParts(NamedTuple):
+    system: str
+    user: str
+    prefix_hash: str  # Hash of everything before the retrieved context
+
+    def messages(self) -> List[Dict]:
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.user}
+        ]
+
+
+def format_history(chat_history: History, language: str) -> str:
+    """History block (rolling summary of older turns + recent turns), '' if there is none"""
+    summary, recent_history = prepare_history(chat_history or [])
+    if not summary and not recent_history:
+        return ""
+    labels = _LABELS[language]
+    lines = [labels['history']]
+    if summary:
+        lines.append(f"{labels['summary']}\n{summary}")
+    for msg in recent_history:
+        role = labels['user'] if msg['role'] == 'user' else labels['assistant']
+        lines.append(f"{role}: {msg['content']}")
+    return "\n".join(lines)
+
+
+def build_prompt(question: str, context: str, is_arabic: bool, chat_history: History = None) -> PromptParts:
+    """Build the system/user prompt: instructions, history, context, question (in that order)"""
+    language = 'ar' if is_arabic else 'en'
+    labels = _LABELS[language]
+    system = SYSTEM_PROMPTS[language]
+
+    prefix = INSTRUCTIONS[language]
+    history = format_history(chat_history, language)
+    if history:
+        prefix = f"{prefix}\n\n{history}"
+
+    user = f"{prefix}\n\n{labels['context']}\n{context}\n\n{labels['question']} {question}"
+    prefix_hash = hashlib.sha1(f"{system}\x00{prefix}".encode('utf-8')).hexdigest()
+    return PromptParts(system, user, prefix_hash)
+
+
+def cached_tokens(usage) -> int:
+    """Prompt tokens served from the provider's prefix cache, if the response reports them"""
+    details = getattr(usage, 'prompt_tokens_details', None)
+    return (getattr(details, 'cached_tokens', None) or 0) if details is not None else 0
+
+
+class PromptCacheStats:
+    """Prefix reuse and cached-token ratio across requests (thread-safe)"""
+
+    def __init__(self, max_prefixes: int = 10000):
+        self.max_prefixes = max_prefixes
+        self.requests = 0
+        self.prefix_hits = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def record(self, prefix_hash: str, usage=None):
+        """Count one request; usage is the response's usage block (None when unavailable, e.g. streams)"""
+        with self._lock:
+            self.requests += 1
+            if prefix_hash in self._seen:
+                self.prefix_hits += 1
+            elif len(self._seen) < self.max_prefixes:
+                self._seen.add(prefix_hash)
+            if usage is not None:
+                self.prompt_tokens += getattr(usage, 'prompt_tokens', 0) or 0
+                self.cached_tokens += cached_tokens(usage)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'prefix_reuse': self.prefix_hits / self.requests if self.requests else 0.0,
+                'prompt_tokens': self.prompt_tokens,
+                'cached_tokens': self.cached_tokens,
+                'cached_ratio': self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0,
+            }
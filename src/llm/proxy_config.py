@@ -0,0 +1,56 @@
+"""
+Read-only access to the LiteLLM proxy configuration (config/llm_proxy_config.yaml)
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = Path(__file__).parent.parent.parent / "config" / "llm_proxy_config.yaml"
+
+_config_cache: Dict[str, Dict] = {}
+
+
+def load_proxy_config(config_path: Optional[Path] = None) -> Dict:
+    """Load and cache the proxy YAML config (empty dict if missing or invalid)"""
+    path = Path(config_path or DEFAULT_CONFIG_PATH)
+    key = str(path.absolute())
+    if key not in _config_cache:
+        try:
+            with open(path, encoding="utf-8") as f:
+                _config_cache[key] = yaml.safe_load(f) or {}
+        except Exception as e:
+            logger.warning(f"Could not load proxy config {path}: {e}")
+            _config_cache[key] = {}
+    return _config_cache[key]
+
+
+def get_model_list(config_path: Optional[Path] = None) -> List[Dict]:
+    """Model entries ({'model_name', 'litellm_params'}) from the proxy config"""
+    return load_proxy_config(config_path).get("model_list", []) or []
+
+
+def get_model_params(model_name: str, config_path: Optional[Path] = None) -> Dict:
+    """litellm_params for a model alias (empty dict if unknown)"""
+    for entry in get_model_list(config_path):
+        if entry.get("model_name") == model_name:
+            return entry.get("litellm_params", {}) or {}
+    return {}
+
+
+def get_fallback_chain(model_name: str, config_path: Optional[Path] = None) -> List[str]:
+    """[model_name, *fallbacks] in the order declared under litellm_settings.fallbacks"""
+    settings = load_proxy_config(config_path).get("litellm_settings", {}) or {}
+    for entry in settings.get("fallbacks", []) or []:
+        if isinstance(entry, dict) and model_name in entry:
+            return [model_name, *(entry[model_name] or [])]
+    return [model_name]
+
+
+def get_model_tiers(config_path: Optional[Path] = None) -> List[Dict]:
+    """Complexity tiers ({'name', 'model', 'max_tokens', 'max_score'}) for client-side routing"""
+    return load_proxy_config(config_path).get("model_tiers", []) or []
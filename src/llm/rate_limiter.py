@@ -0,0 +1,149 @@
+"""
+Client-side pacing of LLM requests to stay within configured rate limits
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.core.config import RATE_LIMIT_MAX_WAIT
+from src.llm.proxy_config import get_model_list
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitExceeded(Exception):
+    """No model has capacity for a request within the allowed wait"""
+
+
+class TokenBucket:
+    """
+    Bucket refilled continuously at `per_minute / 60` units per second, holding at most `per_minute`
+
+    Not locked on its own; ModelLimits reserves its buckets together under one lock.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` units are available (0 if available now)"""
+        self._refill(now)
+        amount = min(amount, self.capacity)  # An oversized request waits for a full bucket, not forever
+        return max(amount - self.level, 0.0) / self.rate
+
+    def take(self, amount: float):
+        """Take units, going negative for a reservation the caller will wait out"""
+        self.level -= min(amount, self.capacity)
+
+
+class ModelLimits:
+    """Requests-per-minute and tokens-per-minute buckets of one model alias (thread-safe)"""
+
+    def __init__(self, model: str, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        self.model = model
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self._lock = threading.Lock()
+
+    def _buckets(self, tokens: int) -> List[Tuple[TokenBucket, float]]:
+        pairs = [(self.requests, 1), (self.tokens, tokens)]
+        return [(bucket, amount) for bucket, amount in pairs if bucket is not None]
+
+    def headroom(self) -> float:
+        """Free share (0-1) of the fuller of the model's buckets"""
+        now = time.monotonic()
+        with self._lock:
+            levels = []
+            for bucket, _ in self._buckets(0):
+                bucket._refill(now)
+                levels.append(max(bucket.level, 0.0) / bucket.capacity)
+            return min(levels, default=1.0)
+
+    def wait_time(self, tokens: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            return max((bucket.wait_time(amount, now) for bucket, amount in self._buckets(tokens)), default=0.0)
+
+    def reserve(self, tokens: int, max_wait: float) -> Optional[float]:
+        """Reserve one request of `tokens`; returns the wait before sending, or None if above max_wait"""
+        now = time.monotonic()
+        with self._lock:
+            buckets = self._buckets(tokens)
+            wait = max((bucket.wait_time(amount, now) for bucket, amount in buckets), default=0.0)
+            if wait > max_wait:
+                return None
+            for bucket, amount in buckets:
+                bucket.take(amount)
+            return wait
+
+
+class RateLimiter:
+    """
+    Per-model rpm/tpm limits from llm_proxy_config.yaml
+
+    A request goes to the first candidate model with spare capacity. If all are
+    saturated it waits for the one that frees up first, up to `max_wait` seconds,
+    instead of being sent into a 429 and the proxy's retry/fallback loop.
+    """
+
+    def __init__(self, config_path: Optional[Path] = None, max_wait: float = RATE_LIMIT_MAX_WAIT):
+        self.max_wait = max_wait
+        self.models: Dict[str, ModelLimits] = {}
+        for entry in get_model_list(config_path):
+            params = entry.get("litellm_params", {}) or {}
+            rpm, tpm = params.get("rpm"), params.get("tpm")
+            if rpm or tpm:
+                name = entry.get("model_name")
+                self.models[name] = ModelLimits(name, int(rpm) if rpm else None, int(tpm) if tpm else None)
+
+    def has_capacity(self, model: str, tokens: int = 0) -> bool:
+        limits = self.models.get(model)
+        return limits is None or limits.wait_time(tokens) == 0
+
+    def headroom(self, models: List[str]) -> float:
+        """Best free share (0-1) among candidate models (1.0 if any is unlimited)"""
+        return max((self.models[model].headroom() if model in self.models else 1.0 for model in models), default=1.0)
+
+    def order_by_capacity(self, models: List[str], tokens: int = 0) -> List[str]:
+        """Models with spare capacity first, otherwise in the given (preference) order"""
+        return sorted(models, key=lambda model: not self.has_capacity(model, tokens))
+
+    def _reserve(self, models: List[str], tokens: int, max_wait: Optional[float]) -> Tuple[str, float]:
+        max_wait = self.max_wait if max_wait is None else max_wait
+        # Soonest-available candidate; ties keep preference order
+        ranked = sorted(models, key=lambda model: self.models[model].wait_time(tokens) if model in self.models else 0.0)
+        for model in ranked:
+            limits = self.models.get(model)
+            if limits is None:
+                return model, 0.0
+            wait = limits.reserve(tokens, max_wait)
+            if wait is not None:
+                if wait > 0:
+                    logger.info(f"⏳ Rate limit: waiting {wait:.1f}s for {model}")
+                return model, wait
+        raise RateLimitExceeded(f"No capacity within {max_wait:.0f}s for {', '.join(models)}")
+
+    def acquire(self, models: List[str], tokens: int = 0, max_wait: Optional[float] = None) -> str:
+        """Block until one of `models` can take the request; returns the chosen model"""
+        model, wait = self._reserve(models, tokens, max_wait)
+        if wait > 0:
+            time.sleep(wait)
+        return model
+
+    async def acquire_async(self, models: List[str], tokens: int = 0, max_wait: Optional[float] = None) -> str:
+        """Async acquire (waits without blocking the event loop)"""
+        model, wait = self._reserve(models, tokens, max_wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return model
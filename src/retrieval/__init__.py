@@ -5,13 +5,31 @@ Query processing and RAG retrieval functionality
 from .rag_query import (
     get_rag_answer,
     get_rag_answer_with_sources,
+    get_rag_answer_stream,
+    get_rag_answers_batch,
     is_arabic,
-    search_multiple_collections
+    search_multiple_collections,
+    RetrievalUnavailable
 )
+from .prefetch import AnswerPrefetcher
+from .query_analyzer import analyze_query, extract_years, normalize_digits
+from .table_lookup import detect_kpis, lookup_table_rows
+from .intent_classifier import match_intent_rules, intent_reply
 
 __all__ = [
     'get_rag_answer',
     'get_rag_answer_with_sources',
+    'get_rag_answer_stream',
+    'get_rag_answers_batch',
     'is_arabic',
     'search_multiple_collections',
+    'RetrievalUnavailable',
+    'AnswerPrefetcher',
+    'analyze_query',
+    'extract_years',
+    'normalize_digits',
+    'detect_kpis',
+    'lookup_table_rows',
+    'match_intent_rules',
+    'intent_reply',
 ]
@@ -0,0 +1,152 @@
+"""
+Query-focused context compression
+Keeps only the sentences of each retrieved chunk that are relevant to the question
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import logging
+import re
+import threading
+
+import numpy as np
+
+from src.core.config import (
+    COMPRESSION_SCORER,
+    COMPRESSION_TOP_SENTENCES,
+    COMPRESSION_NEIGHBORS,
+    SENTENCE_CACHE_SIZE
+)
+from src.core.normalization import normalize_text, text_fingerprint
+from src.core.text_utils import estimate_tokens, split_sentences
+
+logger = logging.getLogger(__name__)
+
+_WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+_STOPWORDS = {normalize_text(word) for word in {
+    # English
+    'the', 'and', 'for', 'are', 'was', 'were', 'what', 'which', 'who', 'how', 'did', 'does',
+    'has', 'have', 'had', 'with', 'from', 'that', 'this', 'about', 'pif', 'tell', 'many', 'much',
+    'its', 'into', 'over', 'than', 'their', 'they', 'you', 'can', 'will', 'been', 'per',
+    # Arabic
+    'في', 'من', 'على', 'إلى', 'الى', 'عن', 'ما', 'ماذا', 'كم', 'هل', 'هي', 'هو', 'التي', 'الذي',
+    'مع', 'كيف', 'أو', 'ثم', 'هذا', 'هذه', 'تلك', 'ذلك', 'كان', 'كانت', 'الصندوق', 'صندوق'
+}}
+
+# Sentence embedding cache (LRU) so repeated chunks are embedded once
+# (shared by request, batch and prefetch threads, so guarded by a lock)
+_sentence_vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_sentence_vectors_lock = threading.Lock()
+
+
+def _terms(text: str) -> set:
+    """Normalized content words of a text"""
+    return {w for w in _WORD_PATTERN.findall(normalize_text(text)) if len(w) > 2 and w not in _STOPWORDS}
+
+
+def _lexical_scores(question: str, sentences: List[str]) -> List[float]:
+    """Score sentences by term overlap with the question, damped by sentence length"""
+    query_terms = _terms(question)
+    if not query_terms:
+        return [0.0] * len(sentences)
+
+    scores = []
+    for sentence in sentences:
+        sentence_terms = _terms(sentence)
+        overlap = len(query_terms & sentence_terms)
+        scores.append(overlap / (len(sentence_terms) ** 0.5) if overlap else 0.0)
+    return scores
+
+
+def _sentence_key(sentence: str) -> str:
+    return text_fingerprint(sentence)
+
+
+def _embedding_scores(query_vector: np.ndarray, sentences: List[str]) -> List[float]:
+    """Score sentences by cosine similarity to the query, embedding only uncached sentences"""
+    from src.core.embedding import embed
+
+    keys = [_sentence_key(s) for s in sentences]
+    vectors = {}
+    with _sentence_vectors_lock:
+        for key in keys:
+            if key in _sentence_vectors:
+                _sentence_vectors.move_to_end(key)
+                vectors[key] = _sentence_vectors[key]
+
+    # Embed outside the lock; a sentence embedded concurrently by another thread is just overwritten
+    missing = list(dict.fromkeys(k for k in keys if k not in vectors))
+    if missing:
+        texts = {k: s for k, s in zip(keys, sentences)}
+        vectors.update(zip(missing, embed([texts[k] for k in missing])))
+        with _sentence_vectors_lock:
+            for key in missing:
+                _sentence_vectors[key] = vectors[key]
+                if len(_sentence_vectors) > SENTENCE_CACHE_SIZE:
+                    _sentence_vectors.popitem(last=False)
+
+    query = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+    return [float(np.dot(vectors[key], query)) for key in keys]
+
+
+def compress_context(
+    question: str,
+    chunks: List[Dict],
+    query_vector: Optional[np.ndarray] = None,
+    top_sentences: int = COMPRESSION_TOP_SENTENCES,
+    neighbors: int = COMPRESSION_NEIGHBORS
+) -> List[Dict]:
+    """
+    Reduce chunks to their most question-relevant sentences
+
+    Sentences across all chunks are ranked against the question; the top ones are
+    kept together with `neighbors` sentences on each side (for local coherence) in
+    their original order. Chunks with no selected sentence are dropped. If nothing
+    scores above zero the chunks are returned unchanged.
+
+    Returns:
+        list of chunk dicts (copies) with compressed 'text'
+    """
+    if not chunks:
+        return chunks
+
+    split = [split_sentences(chunk['text']) for chunk in chunks]
+    flat = [(ci, si, sentence) for ci, sentences in enumerate(split) for si, sentence in enumerate(sentences)]
+    if len(flat) <= top_sentences:
+        return chunks
+
+    sentences = [sentence for _, _, sentence in flat]
+    if COMPRESSION_SCORER == "embedding":
+        try:
+            if query_vector is None:
+                from src.core.embedding import embed_query
+                query_vector = embed_query(question)
+            scores = _embedding_scores(query_vector, sentences)
+        except Exception as e:
+            logger.warning(f"Sentence embedding failed, using lexical scoring: {e}")
+            scores = _lexical_scores(question, sentences)
+    else:
+        scores = _lexical_scores(question, sentences)
+
+    ranked = sorted(range(len(flat)), key=lambda i: scores[i], reverse=True)
+    ranked = [i for i in ranked[:top_sentences] if scores[i] > 0]
+    if not ranked:
+        return chunks
+
+    keep = set()
+    for i in ranked:
+        ci, si, _ = flat[i]
+        for sj in range(max(si - neighbors, 0), min(si + neighbors + 1, len(split[ci]))):
+            keep.add((ci, sj))
+
+    compressed = []
+    for ci, chunk in enumerate(chunks):
+        kept = [sentence for si, sentence in enumerate(split[ci]) if (ci, si) in keep]
+        if kept:
+            text = " ".join(kept)
+            compressed.append({**chunk, 'text': text, 'token_count': estimate_tokens(text)})
+
+    before = sum(estimate_tokens(chunk['text']) for chunk in chunks)
+    after = sum(chunk['token_count'] for chunk in compressed)
+    logger.info(f"Compressed context: {before} -> {after} tokens ({1 - after / max(before, 1):.0%} reduction)")
+    return compressed
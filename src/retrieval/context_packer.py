@@ -0,0 +1,55 @@
+"""
+Token-budgeted context packing for answer generation
+Keeps prompt size predictable regardless of chunk sizes
+"""
+
+from typing import Dict, List
+import logging
+
+from src.core.config import PROMPT_TOKEN_BUDGET, HISTORY_TOKEN_RESERVE, MIN_CHUNK_TOKENS
+from src.core.text_utils import estimate_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+
+def chunk_tokens(chunk: Dict) -> int:
+    """Token count of a chunk: stored at ingestion time, estimated for older collections"""
+    return chunk.get('token_count') or estimate_tokens(chunk['text'])
+
+
+def context_budget(history_tokens: int = 0, prompt_budget: int = PROMPT_TOKEN_BUDGET) -> int:
+    """Tokens left for retrieved context after reserving room for chat history"""
+    return max(prompt_budget - min(history_tokens, HISTORY_TOKEN_RESERVE), MIN_CHUNK_TOKENS)
+
+
+def pack_context(chunks: List[Dict], token_budget: int) -> List[Dict]:
+    """
+    Greedily fill a token budget with the highest-scoring chunks
+
+    Chunks that do not fit are truncated at a sentence boundary; packing stops
+    once the remaining budget is too small to hold a useful passage.
+
+    Returns:
+        list of chunk dicts (copies) with 'text' and 'token_count' adjusted
+    """
+    packed = []
+    remaining = token_budget
+
+    for chunk in sorted(chunks, key=lambda c: c.get('score', 0.0), reverse=True):
+        if remaining < MIN_CHUNK_TOKENS:
+            break
+
+        tokens = chunk_tokens(chunk)
+        if tokens <= remaining:
+            packed.append({**chunk, 'token_count': tokens})
+            remaining -= tokens
+            continue
+
+        truncated = truncate_to_tokens(chunk['text'], remaining)
+        if truncated:
+            truncated_tokens = estimate_tokens(truncated)
+            packed.append({**chunk, 'text': truncated, 'token_count': truncated_tokens, 'truncated': True})
+            remaining -= truncated_tokens
+
+    logger.info(f"Packed {len(packed)}/{len(chunks)} chunks into {token_budget - remaining}/{token_budget} tokens")
+    return packed
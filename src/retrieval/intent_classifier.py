@@ -0,0 +1,197 @@
+"""
+Fast-path intent classification before retrieval
+Greetings, thanks and out-of-scope messages get a templated reply instead of
+paying for embedding, collection searches and an LLM call
+"""
+
+from threading import Lock
+from typing import Dict, Optional
+import logging
+import re
+
+import numpy as np
+
+from src.core.config import INTENT_CENTROID_MARGIN
+from src.core.deadline import Deadline, call_with_timeout
+from src.core.normalization import normalize_text
+
+logger = logging.getLogger(__name__)
+
+INTENT_CORPUS = 'corpus'
+INTENT_GREETING = 'greeting'
+INTENT_THANKS = 'thanks'
+INTENT_GOODBYE = 'goodbye'
+INTENT_CHITCHAT = 'chitchat'
+INTENT_OUT_OF_SCOPE = 'out_of_scope'
+
+
+def _compile(pattern: str) -> re.Pattern:
+    """Compile a pattern for matching normalized text (Arabic literals are normalized too)"""
+    return re.compile(normalize_text(pattern))
+
+
+# Anything that looks like a question about the reports goes through the full pipeline
+_CORPUS_HINTS = _compile(
+    r'\b(?:pif|fund|invest\w*|report\w*|aum|assets?|portfolio|neom|vision|giga|sectors?|jobs?|'
+    r'revenue\w*|profit\w*|income|compan\w*|strategy|sustainab\w*|esg|saudi|riyadh)\b'
+    r'|\d{4}|صندوق|استثمار|تقرير|رؤية|نيوم|أصول|وظائف|قطاع|شركات|إيرادات|السعودية'
+)
+
+# Whole-message chitchat patterns (normalized text, punctuation stripped)
+_INTENT_RULES = [
+    (INTENT_GREETING, _compile(
+        r'^(?:hi|hello|hey|hiya|greetings|good (?:morning|afternoon|evening)|how are you(?: doing)?|'
+        r'مرحبا|أهلا|السلام عليكم|صباح الخير|مساء الخير|كيف حالك)'
+        r'(?: (?:again|there|everyone|bot|صديقي))*$'
+    )),
+    (INTENT_THANKS, _compile(
+        r'^(?:(?:ok(?:ay)? |great |perfect )?(?:thanks?|thank you|thx|ty|cheers|much appreciated|'
+        r'شكرا|شكرا لك|شكرا جزيلا|مشكور|يعطيك العافية))(?: (?:so much|a lot|again|very much|جزيلا))*$'
+    )),
+    (INTENT_GOODBYE, _compile(
+        r'^(?:bye|goodbye|see you|see ya|good night|مع السلامة|وداعا|إلى اللقاء|تصبح على خير)'
+        r'(?: (?:now|later|soon))*$'
+    )),
+    (INTENT_OUT_OF_SCOPE, _compile(
+        r'\b(?:weather|recipe|joke|football|soccer|movie|song|poem|lyrics|horoscope|homework)\b'
+        r'|طقس|وصفة|نكتة|كرة القدم|فيلم|أغنية|قصيدة'
+    )),
+]
+
+_PUNCTUATION = re.compile(r'[^\w\s]', re.UNICODE)
+
+# Example messages per intent; their embedding centroids classify what the rules cannot
+_CENTROID_EXAMPLES = {
+    INTENT_CORPUS: [
+        "What are PIF's main investment sectors?",
+        "How many jobs did the fund create?",
+        "What is the value of assets under management?",
+        "ما هي استراتيجية صندوق الاستثمارات العامة؟",
+        "كم عدد الشركات التي أسسها الصندوق؟",
+    ],
+    INTENT_CHITCHAT: [
+        "Who are you?",
+        "What can you do?",
+        "Nice to meet you",
+        "من أنت؟",
+        "ماذا تستطيع أن تفعل؟",
+    ],
+    INTENT_OUT_OF_SCOPE: [
+        "Write me a python script",
+        "What is the capital of France?",
+        "Recommend a good restaurant",
+        "Translate this sentence to French",
+        "ما هي عاصمة فرنسا؟",
+        "اكتب لي قصة قصيرة",
+    ],
+}
+
+INTENT_REPLIES = {
+    INTENT_GREETING: {
+        'en': "Hello! 👋 Ask me anything about PIF's annual reports - investments, Vision 2030 projects, financial results or sustainability.",
+        'ar': "أهلاً بك! 👋 اسألني عن أي شيء في التقارير السنوية لصندوق الاستثمارات العامة - الاستثمارات أو مشاريع رؤية 2030 أو النتائج المالية أو الاستدامة.",
+    },
+    INTENT_THANKS: {
+        'en': "You're welcome! 😊 Let me know if you have another question about PIF.",
+        'ar': "على الرحب والسعة! 😊 يسعدني الإجابة عن أي سؤال آخر حول صندوق الاستثمارات العامة.",
+    },
+    INTENT_GOODBYE: {
+        'en': "Goodbye! 👋 Come back any time to explore PIF's annual reports.",
+        'ar': "مع السلامة! 👋 يسعدني مساعدتك في أي وقت لاستكشاف تقارير الصندوق السنوية.",
+    },
+    INTENT_CHITCHAT: {
+        'en': "I'm the PIF reports assistant. I answer questions from PIF's annual reports (2021-2023) - try asking about investments, jobs or assets under management.",
+        'ar': "أنا مساعد تقارير صندوق الاستثمارات العامة. أجيب عن الأسئلة من التقارير السنوية للصندوق (2021-2023) - جرّب السؤال عن الاستثمارات أو الوظائف أو الأصول المدارة.",
+    },
+    INTENT_OUT_OF_SCOPE: {
+        'en': "Sorry, I can only answer questions about PIF's annual reports. Try asking about PIF's investments, projects or financial results.",
+        'ar': "عذراً، يمكنني الإجابة فقط عن الأسئلة المتعلقة بالتقارير السنوية لصندوق الاستثمارات العامة. جرّب السؤال عن استثمارات الصندوق أو مشاريعه أو نتائجه المالية.",
+    },
+}
+
+_centroids: Optional[Dict[str, np.ndarray]] = None
+_centroids_lock = Lock()
+
+
+def match_intent_rules(question: str) -> Optional[str]:
+    """
+    Classify a message with keyword rules (no model calls)
+
+    Returns INTENT_CORPUS when the message mentions the reports' subject matter,
+    a chitchat/out-of-scope intent when a rule matches, or None when inconclusive.
+    """
+    text = normalize_text(question)
+    if _CORPUS_HINTS.search(text):
+        return INTENT_CORPUS
+
+    text = ' '.join(_PUNCTUATION.sub(' ', text).split())
+    for intent, pattern in _INTENT_RULES:
+        if pattern.search(text):
+            return intent
+    return None
+
+
+def _get_centroids(deadline: Optional[Deadline] = None) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Normalized mean embedding per intent, computed once
+
+    Returns None (the caller skips the centroid check) while another request is
+    building the centroids, or when embedding fails or misses the deadline; only
+    a complete set is cached, so the next call retries.
+    """
+    global _centroids
+    if _centroids is not None:
+        return _centroids
+    if not _centroids_lock.acquire(blocking=False):
+        return None
+    try:
+        if _centroids is None:
+            from src.core.embedding import embed_queries
+            examples = [(intent, text) for intent, texts in _CENTROID_EXAMPLES.items() for text in texts]
+            texts = [text for _, text in examples]
+            try:
+                if deadline is not None:
+                    vectors = call_with_timeout(embed_queries, deadline.remaining(), texts)
+                else:
+                    vectors = embed_queries(texts)
+            except Exception as e:
+                logger.warning(f"Intent centroids unavailable: {e}")
+                return None
+            # embed_queries returns zero rows for failed batches
+            if not vectors.any(axis=1).all():
+                logger.warning("Intent centroids unavailable: example embedding failed")
+                return None
+            intents = np.array([intent for intent, _ in examples])
+            centroids = {}
+            for intent in _CENTROID_EXAMPLES:
+                mean = vectors[intents == intent].mean(axis=0)
+                centroids[intent] = mean / (np.linalg.norm(mean) or 1.0)
+            _centroids = centroids
+        return _centroids
+    finally:
+        _centroids_lock.release()
+
+
+def nearest_intent(query_vector: np.ndarray, margin: float = INTENT_CENTROID_MARGIN,
+                   deadline: Optional[Deadline] = None) -> str:
+    """
+    Nearest-centroid intent for an embedded query
+
+    Leaving the corpus pipeline requires beating the corpus centroid by `margin`,
+    so borderline questions are still answered from the reports.
+    """
+    centroids = _get_centroids(deadline)
+    if not centroids or not query_vector.any():
+        return INTENT_CORPUS
+
+    query = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+    scores = {intent: float(np.dot(centroid, query)) for intent, centroid in centroids.items()}
+    best = max(scores, key=scores.get)
+    if best != INTENT_CORPUS and scores[best] - scores[INTENT_CORPUS] >= margin:
+        return best
+    return INTENT_CORPUS
+
+
+def intent_reply(intent: str, is_arabic: bool) -> str:
+    """Templated reply for a non-corpus intent"""
+    return INTENT_REPLIES[intent]['ar' if is_arabic else 'en']
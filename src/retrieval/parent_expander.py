@@ -0,0 +1,58 @@
+"""
+Small-to-big expansion: replace winning child passages with their parent sections
+"""
+
+from collections import defaultdict
+from typing import Dict, List
+import logging
+
+from src.core.config import PARENT_EXPANSION_BUDGET
+from src.core.qdrant_utils import fetch_parents
+from src.retrieval.context_packer import chunk_tokens
+
+logger = logging.getLogger(__name__)
+
+
+def expand_to_parents(qdrant, results: List[Dict], token_budget: int = PARENT_EXPANSION_BUDGET) -> List[Dict]:
+    """
+    Expand child hits to their parent sections, best-scoring first
+
+    Each parent appears once (with its best child's score). A parent is used only
+    while it fits in the token budget; otherwise the child passage is kept as is.
+    Results without a parent_id (collections indexed before parent-child
+    indexing) pass through unchanged.
+    """
+    wanted = defaultdict(set)
+    for result in results:
+        if result.get('parent_id') is not None:
+            wanted[result['source']].add(result['parent_id'])
+    if not wanted:
+        return results
+
+    parents = {}
+    for source, parent_ids in wanted.items():
+        try:
+            for parent_id, payload in fetch_parents(qdrant, f"{source}_parents", parent_ids).items():
+                parents[(source, parent_id)] = payload
+        except Exception as e:
+            logger.warning(f"Could not fetch parent sections for {source}: {e}")
+
+    expanded = []
+    seen_parents = set()
+    used = 0
+    for result in sorted(results, key=lambda r: r['score'], reverse=True):
+        key = (result['source'], result.get('parent_id'))
+        if key in seen_parents:
+            continue
+
+        parent = parents.get(key)
+        if parent is not None:
+            seen_parents.add(key)
+            parent_chunk = {**result, 'text': parent.get('text', ''), 'token_count': parent.get('token_count')}
+            if used + chunk_tokens(parent_chunk) <= token_budget:
+                result = parent_chunk
+        used += chunk_tokens(result)
+        expanded.append(result)
+
+    logger.info(f"Expanded {len(results)} hits to {len(expanded)} passages ({used} tokens)")
+    return expanded
@@ -0,0 +1,102 @@
+"""
+Background answer prefetching for suggested follow-up questions
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from src.core.config import (
+    PREFETCH_MAX_WORKERS,
+    PREFETCH_SESSION_BUDGET,
+    PREFETCH_WAIT_TIMEOUT,
+    PREFETCH_MIN_HEADROOM,
+    RAG_REQUEST_TIMEOUT
+)
+from src.core.deadline import Deadline
+from src.core.normalization import normalize_text, text_fingerprint
+from src.llm.llm_proxy import get_llm_proxy
+from src.retrieval.rag_query import get_rag_answer
+
+logger = logging.getLogger(__name__)
+
+# Shared by all sessions so speculative work never exceeds PREFETCH_MAX_WORKERS threads
+_executor = ThreadPoolExecutor(max_workers=PREFETCH_MAX_WORKERS, thread_name_prefix="prefetch")
+
+
+def _history_key(chat_history: List[Dict]) -> int:
+    """Fingerprint of the conversation a prefetched answer was computed for"""
+    return hash(tuple((msg.get('role'), text_fingerprint(msg.get('content') or '')) for msg in chat_history))
+
+
+def _speculative_answer(question: str, chat_history: List[Dict], deadline: Deadline,
+                        session_id: Optional[str] = None) -> Optional[str]:
+    """
+    Answer a follow-up speculatively, yielding to real requests
+
+    Skipped when cancelled before it starts, or when the LLM rate limits have less
+    than PREFETCH_MIN_HEADROOM free (real questions keep the remaining quota).
+    """
+    if deadline.expired():
+        return None
+    proxy = get_llm_proxy()
+    headroom = proxy.rate_limiter.headroom(proxy.model_chain)
+    if headroom < PREFETCH_MIN_HEADROOM:
+        logger.info(f"Skipping prefetch, LLM rate limit headroom {headroom:.0%}")
+        return None
+    return get_rag_answer(question, chat_history, deadline=deadline, session_id=session_id)
+
+
+class AnswerPrefetcher:
+    """Per-session speculative answers for follow-up questions"""
+
+    def __init__(self, budget: int = PREFETCH_SESSION_BUDGET, session_id: Optional[str] = None):
+        self.budget = budget
+        self.session_id = session_id
+        self.used = 0
+        self._futures: Dict[Tuple[str, int], Tuple[Future, Deadline]] = {}
+
+    def prefetch(self, questions: List[str], chat_history: List[Dict]):
+        """Start answering questions in the background (skipped once the session budget is spent)"""
+        history = list(chat_history)
+        history_key = _history_key(history)
+        for question in questions:
+            key = (normalize_text(question), history_key)
+            if key in self._futures:
+                continue
+            if self.used >= self.budget:
+                logger.info("Prefetch budget exhausted for this session")
+                break
+            deadline = Deadline(RAG_REQUEST_TIMEOUT)
+            future = _executor.submit(_speculative_answer, question, history, deadline, self.session_id)
+            self._futures[key] = (future, deadline)
+            self.used += 1
+
+    def get(self, question: str, chat_history: List[Dict], timeout: float = PREFETCH_WAIT_TIMEOUT) -> Optional[str]:
+        """
+        Return the prefetched answer for a question asked after this exact history
+
+        Waits up to `timeout` for a prefetch that is still running (it started earlier
+        than a fresh call would), then cancels it; returns None on a miss, skip,
+        cancellation, timeout or failure, and the caller answers normally.
+        """
+        entry = self._futures.pop((normalize_text(question), _history_key(chat_history)), None)
+        if entry is None:
+            return None
+        future, deadline = entry
+        if future.cancelled():
+            return None
+        try:
+            return future.result(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Prefetched answer unavailable: {e!r}")
+            future.cancel()
+            deadline.cancel()
+            return None
+
+    def cancel_all(self):
+        """Drop all outstanding prefetches: queued ones are cancelled, running ones stop at their next stage"""
+        for future, deadline in self._futures.values():
+            future.cancel()
+            deadline.cancel()
+        self._futures.clear()
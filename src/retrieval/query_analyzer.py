@@ -0,0 +1,80 @@
+"""
+Lightweight query analysis: year extraction and comparative intent detection
+Used to route a question to the matching year collections only
+"""
+
+import re
+from typing import Dict, Iterable, List
+
+from src.core.normalization import normalize_digits, normalize_text
+
+_YEAR_PATTERN = re.compile(r'(?<!\d)(20\d{2})(?!\d)')
+
+# "2021-2023", "2021 to 2023", "from 2021 until 2023", "من 2021 إلى 2023"
+_RANGE_PATTERN = re.compile(
+    r'(?<!\d)(20\d{2})\s*(?:-|–|—|to|until|through|إلى|الى|حتى)\s*(20\d{2})(?!\d)',
+    re.IGNORECASE
+)
+# "between 2021 and 2023", "بين 2021 و2023"
+_BETWEEN_PATTERN = re.compile(
+    r'(?:between|بين)\s+(20\d{2})\s*(?:and|&|و)\s*(20\d{2})(?!\d)',
+    re.IGNORECASE
+)
+
+_COMPARATIVE_EN = re.compile(
+    r'\b(compare|compared|comparison|comparing|versus|vs\.?|change[sd]?|growth|grew|'
+    r'increase[sd]?|decrease[sd]?|difference|trend|evolv(?:e|ed|ing)|over the years|'
+    r'year[- ]over[- ]year|between)\b',
+    re.IGNORECASE
+)
+# Arabic patterns are matched against normalized text (see normalize_text)
+_COMPARATIVE_AR = re.compile(normalize_text(
+    r'(مقارنة|قارن|مقابل|تغير|التغير|نمو|نما|زيادة|ارتفاع|انخفاض|الفرق|تطور|بين)'
+))
+
+_BROAD_EN = re.compile(
+    r'\b(summar(?:y|ize|ise)|overview|overall|highlights?|big picture|in general|'
+    r'performance|achievements|key (?:facts|points|takeaways))\b',
+    re.IGNORECASE
+)
+_BROAD_AR = re.compile(normalize_text(r'(ملخص|لخص|تلخيص|نظرة عامة|بشكل عام|أبرز|أداء|إنجازات)'))
+
+
+def extract_years(text: str, available_years: Iterable[str]) -> List[str]:
+    """Extract years (single values and ranges) mentioned in the text, limited to available years"""
+    available = sorted(available_years)
+    text = normalize_digits(text)
+    found = set()
+
+    for match in [*_RANGE_PATTERN.finditer(text), *_BETWEEN_PATTERN.finditer(text)]:
+        start, end = sorted((int(match.group(1)), int(match.group(2))))
+        found.update(str(year) for year in range(start, end + 1))
+
+    found.update(_YEAR_PATTERN.findall(text))
+
+    return [year for year in available if year in found]
+
+
+def is_comparative(text: str) -> bool:
+    """Detect comparative phrasing in English or Arabic"""
+    return bool(_COMPARATIVE_EN.search(text) or _COMPARATIVE_AR.search(normalize_text(text)))
+
+
+def is_broad_question(text: str) -> bool:
+    """Detect summary/overview style questions in English or Arabic"""
+    return bool(_BROAD_EN.search(text) or _BROAD_AR.search(normalize_text(text)))
+
+
+def analyze_query(question: str, available_years: Iterable[str]) -> Dict:
+    """
+    Analyze a question for year routing
+
+    Returns:
+        dict with 'years' (matching available years, sorted), 'is_comparative' and 'is_broad'
+    """
+    years = extract_years(question, available_years)
+    return {
+        'years': years,
+        'is_comparative': is_comparative(question) or len(years) > 1,
+        'is_broad': is_broad_question(question)
+    }
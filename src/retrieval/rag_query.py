@@ -1,11 +1,37 @@
 from pathlib import Path
 from src.core.config import year_to_filename_ar, year_to_filename_en
-from src.core.embedding import embed_query
+from src.core.embedding import embed_query, embed_queries
+from src.core.normalization import normalize_text
 from src.llm.llm_proxy import get_llm_proxy
+from src.llm.history_manager import history_token_count, prepare_history
+from src.llm.complexity_router import score_complexity
+from src.retrieval.query_analyzer import analyze_query, is_broad_question
+from src.retrieval.context_packer import pack_context, context_budget
+from src.retrieval.context_compressor import compress_context
+from src.retrieval.parent_expander import expand_to_parents
+from src.retrieval.table_lookup import lookup_table_rows, TABLE_LEVEL
+from src.retrieval.intent_classifier import match_intent_rules, nearest_intent, intent_reply, INTENT_CORPUS
+from src.core.config import (
+    COMPRESSION_ENABLED,
+    BATCH_MAX_CONCURRENCY,
+    RAG_REQUEST_TIMEOUT,
+    BILINGUAL_SEARCH,
+    LANGUAGE_SCORE_CALIBRATION,
+    SUMMARY_CONTEXT_LIMIT,
+    COMPRESSION_TOP_SENTENCES,
+    COMPARISON_CHUNKS_PER_YEAR,
+    TABLE_INDEX_ENABLED,
+    INTENT_FAST_PATH,
+    INTENT_CENTROID_ENABLED,
+    LLM_COALESCE_REQUESTS
+)
+from src.core.deadline import Deadline, DeadlineExceeded
+from src.core.timing import StageTimer, timed
 from qdrant_client import QdrantClient
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import re
 import json
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterable, Iterator, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,87 +39,399 @@ logger = logging.getLogger(__name__)
 # Initialize Qdrant client once
 _qdrant = QdrantClient(host='localhost', port=6333)
 
+LANGUAGE_COLLECTIONS = {'ar': year_to_filename_ar, 'en': year_to_filename_en}
+
+# filename -> whether its optional <filename>_summaries collection exists
+_summary_collections: Dict[str, bool] = {}
+
+# Collection searches run concurrently: latency is the slowest search, not the sum
+_search_executor = ThreadPoolExecutor(max_workers=6, thread_name_prefix="qdrant-search")
+
+class RetrievalUnavailable(RuntimeError):
+    """Retrieval cannot produce meaningful results (e.g. query embedding failed)"""
+
+DEGRADED_ANSWER_AR = "عذراً، خدمة البحث بطيئة أو غير متاحة حالياً، لذلك لم أتمكن من البحث في التقارير. يرجى المحاولة مرة أخرى بعد قليل."
+DEGRADED_ANSWER_EN = "Sorry, the document search service is slow or unavailable right now, so I couldn't search the reports. Please try again in a moment."
+
+NO_CONTEXT_ANSWER_AR = "عذراً، لم أجد معلومات محددة حول هذا السؤال في تقارير صندوق الاستثمارات العامة السنوية. يمكنك إعادة صياغة سؤالك أو السؤال عن جانب مختلف من استثمارات الصندوق."
+NO_CONTEXT_ANSWER_EN = "I'm sorry, I couldn't find specific information about that in the PIF annual reports. You can rephrase your question or ask about a different aspect of PIF's investments."
+
+ERROR_ANSWER_AR = "عذراً، حدث خطأ في معالجة سؤالك. يرجى المحاولة مرة أخرى أو طرح سؤال مختلف."
+ERROR_ANSWER_EN = "I'm sorry, there was an error processing your question. Please try again or ask a different question."
+
 def is_arabic(text):
     """Detect if text contains Arabic characters"""
     arabic_pattern = re.compile(r'[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]')
     return bool(arabic_pattern.search(text))
 
-def search_multiple_collections(question: str, is_arabic: bool, limit_per_collection: int = 3) -> List[Dict]:
-    """Search across multiple years and collections for better coverage"""
-    results = []
+def _hit_to_result(hit, year: str, filename: str, language: Optional[str] = None) -> Dict:
+    """Convert a Qdrant hit into a context chunk dict (score calibrated per collection language)"""
+    result = {
+        'text': hit.payload.get("text", ""),
+        'token_count': hit.payload.get("token_count"),
+        'parent_id': hit.payload.get("parent_id"),
+        'level': hit.payload.get("level"),
+        'score': hit.score,
+        'year': year,
+        'source': filename
+    }
+    if language is not None:
+        calibration = LANGUAGE_SCORE_CALIBRATION.get(language, {})
+        result['language'] = language
+        result['raw_score'] = hit.score
+        result['score'] = hit.score * calibration.get('scale', 1.0) + calibration.get('bias', 0.0)
+    return result
+
+def _dedupe_results(results: List[Dict], top_k: int = 5) -> List[Dict]:
+    """Sort by score and drop near-duplicate chunks (child passages of the same parent count once)"""
+    # Sort by relevance score and remove duplicates
+    results = sorted(results, key=lambda x: x['score'], reverse=True)
     
-    if is_arabic:
-        collections = year_to_filename_ar
-    else:
-        collections = year_to_filename_en
+    # Remove duplicate content (simple text similarity)
+    unique_results = []
+    seen_texts = set()
+    for result in results:
+        if result.get('parent_id') is not None:
+            text_key = (result['source'], result['parent_id'])
+        else:
+            text_key = normalize_text(result['text'][:200])[:100]  # Normalized first 100 chars as key
+        if text_key not in seen_texts:
+            unique_results.append(result)
+            seen_texts.add(text_key)
     
-    # Get query embedding using Ollama (no need to pass model/tokenizer)
-    try:
-        query_vector = embed_query(question)
-    except Exception as e:
-        logger.error(f"Error generating query embedding: {e}")
-        return []
+    return unique_results[:top_k]
+
+def _route_collections(question: str, is_arabic: bool):
+    """
+    Pick the collections to search for a question
     
-    # Search in all available years
-    for year, filename in collections.items():
-        try:
-            collection_name = f"{filename}_collection"
+    Returns:
+        (primary, fallback) year -> filename dicts; fallback is searched only
+        when the years named in the question return nothing
+    """
+    collections = LANGUAGE_COLLECTIONS['ar' if is_arabic else 'en']
+    
+    # Route to the years named in the question (e.g. "jobs created in 2022")
+    query_info = analyze_query(question, collections.keys())
+    if not query_info['years']:
+        return dict(collections), {}
+    
+    routed = {year: collections[year] for year in query_info['years']}
+    remaining = {year: name for year, name in collections.items() if year not in routed}
+    return routed, remaining
+
+def _plan_comparison(question: str, is_arabic: bool) -> Optional[List[str]]:
+    """
+    Years to compare for a multi-year question ("how did AUM change from 2021 to 2023?")
+    
+    A plan needs two or more available years, named or as a span ("2021-2023",
+    "between 2021 and 2022"). Returns None otherwise, including comparative
+    wording without years ("difference between giga-projects and portfolio
+    companies"), which gets the normal single retrieval.
+    """
+    collections = LANGUAGE_COLLECTIONS['ar' if is_arabic else 'en']
+    years = analyze_query(question, collections.keys())['years']
+    return years if len(years) > 1 else None
+
+def _balance_by_year(results: List[Dict], years: List[str], per_year: int) -> List[Dict]:
+    """Top `per_year` unique results for each year, in year order"""
+    balanced = []
+    for year in years:
+        balanced.extend(_dedupe_results([r for r in results if r['year'] == year], top_k=per_year))
+    return balanced
+
+def _search_one(query_vector, year: str, filename: str, language: Optional[str], limit_per_collection: int,
+                timer: Optional[StageTimer] = None, deadline: Optional[Deadline] = None,
+                suffix: str = "_collection") -> List[Dict]:
+    """Search a single collection (errors are logged, not raised)"""
+    collection_name = f"{filename}{suffix}"
+    if deadline is not None and deadline.expired():
+        logger.warning(f"Deadline reached, skipping {collection_name}")
+        return []
+    try:
+        # Server-side timeout in whole seconds, bounded by the request deadline
+        search_options = {'timeout': max(1, int(deadline.remaining()))} if deadline is not None else {}
+        with timed(timer, f"search:{collection_name}"):
             year_results = _qdrant.search(
                 collection_name=collection_name,
                 query_vector=query_vector[0].tolist(),
                 limit=limit_per_collection,
                 with_payload=True,
-                score_threshold=0.3  # Only include relevant results
+                score_threshold=0.3,  # Only include relevant results
+                **search_options
             )
-            
-            for result in year_results:
-                results.append({
-                    'text': result.payload.get("text", ""),
-                    'score': result.score,
-                    'year': year,
-                    'source': filename
-                })
+        return [_hit_to_result(result, year, filename, language) for result in year_results]
+    except Exception as e:
+        logger.error(f"Error searching collection {collection_name}: {e}")
+        return []
+
+def _search_collections(query_vector, collections_by_language: Dict[str, Dict[str, str]], limit_per_collection: int,
+                        timer: Optional[StageTimer] = None, deadline: Optional[Deadline] = None,
+                        suffix: str = "_collection") -> List[Dict]:
+    """Search {language: {year: filename}} collections concurrently with one query vector"""
+    futures = [
+        _search_executor.submit(_search_one, query_vector, year, filename, language,
+                                limit_per_collection, timer, deadline, suffix)
+        for language, collections in collections_by_language.items()
+        for year, filename in collections.items()
+    ]
+    results = []
+    for future in futures:
+        results.extend(future.result())
+    return results
+
+def _has_summaries(filename: str) -> bool:
+    """Whether a report has a summary collection (the summary tier is optional; looked up once per report)"""
+    if filename not in _summary_collections:
+        try:
+            existing = {collection.name for collection in _qdrant.get_collections().collections}
         except Exception as e:
-            logger.error(f"Error searching collection {collection_name}: {e}")
-            continue
+            logger.warning(f"Could not list Qdrant collections: {e}")
+            return False
+        _summary_collections[filename] = f"{filename}_summaries" in existing
+        if not _summary_collections[filename]:
+            logger.debug(f"No summary collection for {filename}, broad questions use passage search")
+    return _summary_collections[filename]
+
+def _search_summaries(query_vector, collections_by_language: Dict[str, Dict[str, str]],
+                      timer: Optional[StageTimer] = None, deadline: Optional[Deadline] = None) -> List[Dict]:
+    """Report-level summaries first, then the best section summaries (empty if none are indexed)"""
+    indexed = {
+        language: {year: filename for year, filename in collections.items() if _has_summaries(filename)}
+        for language, collections in collections_by_language.items()
+    }
+    results = _search_collections(query_vector, indexed, SUMMARY_CONTEXT_LIMIT,
+                                  timer, deadline, suffix="_summaries")
+    results.sort(key=lambda r: (r.get('level') == 'report', r['score']), reverse=True)
+    return results[:SUMMARY_CONTEXT_LIMIT]
+
+def _table_context(question: str, years_by_language: Dict[str, Iterable[str]],
+                   timer: Optional[StageTimer] = None) -> List[Dict]:
+    """Exact table rows for KPI questions (empty when disabled or not a KPI question)"""
+    if not TABLE_INDEX_ENABLED:
+        return []
+    with timed(timer, "table_lookup"):
+        return [
+            chunk
+            for language, years in years_by_language.items()
+            for chunk in lookup_table_rows(question, years, language)
+        ]
+
+def _embed_question(question: str, timer: Optional[StageTimer] = None, deadline: Optional[Deadline] = None):
+    """Embed a question for search, raising RetrievalUnavailable instead of returning a zero vector"""
+    # Get query embedding using Ollama (no need to pass model/tokenizer)
+    try:
+        with timed(timer, "query_embedding"):
+            query_vector = embed_query(question, deadline=deadline)
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating query embedding: {e}")
+        raise RetrievalUnavailable(f"Query embedding failed: {e}") from e
     
-    # Sort by relevance score and remove duplicates
-    results.sort(key=lambda x: x['score'], reverse=True)
+    if not query_vector.any():
+        raise RetrievalUnavailable("Query embedding unavailable")
+    return query_vector
+
+def _classify_question(question: str, timer: Optional[StageTimer] = None, deadline: Optional[Deadline] = None):
+    """
+    Fast-path intent check before retrieval
     
-    # Remove duplicate content (simple text similarity)
-    unique_results = []
-    seen_texts = set()
-    for result in results:
-        text_key = result['text'][:100]  # Use first 100 chars as key
-        if text_key not in seen_texts:
-            unique_results.append(result)
-            seen_texts.add(text_key)
+    Keyword rules run first; when they are inconclusive the question is embedded
+    (the embedding is reused for the search) and matched against intent centroids.
     
-    return unique_results[:5]  # Return top 5 unique results
+    Returns:
+        (intent, query_vector or None)
+    """
+    if not INTENT_FAST_PATH:
+        return INTENT_CORPUS, None
+    with timed(timer, "intent_classification"):
+        intent = match_intent_rules(question)
+    if intent is not None or not INTENT_CENTROID_ENABLED:
+        return intent or INTENT_CORPUS, None
+    
+    query_vector = _embed_question(question, timer, deadline)
+    with timed(timer, "intent_classification"):
+        return nearest_intent(query_vector, deadline=deadline), query_vector
 
-def generate_answer_from_context(question: str, context_chunks: List[Dict], is_arabic: bool, chat_history: List[Dict] = None) -> str:
-    """Generate a comprehensive answer using LLM proxy with chat history"""
-    if not context_chunks:
+def search_multiple_collections(question: str, is_arabic: bool, limit_per_collection: int = 3,
+                                timer: Optional[StageTimer] = None, deadline: Optional[Deadline] = None,
+                                bilingual: Optional[bool] = None, query_vector=None) -> List[Dict]:
+    """
+    Search across multiple years and collections for better coverage
+    
+    In bilingual mode (BILINGUAL_SEARCH or bilingual=True) the Arabic and English
+    collections are searched concurrently with the same query vector and merged
+    into one ranked list after per-language score calibration. A precomputed
+    query_vector (e.g. from intent classification) skips the embedding call.
+    
+    Raises:
+        RetrievalUnavailable: if the query could not be embedded (searching
+        with a zero vector would only return noise)
+    """
+    if query_vector is None:
+        query_vector = _embed_question(question, timer, deadline)
+    
+    if bilingual is None:
+        bilingual = BILINGUAL_SEARCH
+    if bilingual:
+        languages = {'ar': True, 'en': False}
+    else:
+        languages = {'ar' if is_arabic else 'en': is_arabic}
+    routes = {language: _route_collections(question, arabic) for language, arabic in languages.items()}
+    
+    primary = {language: route[0] for language, route in routes.items()}
+    fallback = {language: route[1] for language, route in routes.items() if route[1]}
+    
+    # Comparative questions: concurrent per-year sub-retrievals with a fixed per-year quota
+    comparison_years = _plan_comparison(question, is_arabic)
+    if comparison_years:
+        logger.info(f"Comparison plan: {', '.join(comparison_years)}")
+        targets = {
+            language: {year: LANGUAGE_COLLECTIONS[language][year] for year in comparison_years}
+            for language in languages
+        }
+        per_collection = max(limit_per_collection, COMPARISON_CHUNKS_PER_YEAR * 2)
+        results = _search_collections(query_vector, targets, per_collection, timer, deadline)
+        with timed(timer, "dedupe_rerank"):
+            results = _balance_by_year(results, comparison_years, COMPARISON_CHUNKS_PER_YEAR)
+        with timed(timer, "parent_expansion"):
+            results = expand_to_parents(_qdrant, results)
+        table_rows = _table_context(question, {language: comparison_years for language in languages}, timer)
+        return results + table_rows
+    
+    # Broad questions ("summarize 2023 performance") are answered from the summary tier
+    if is_broad_question(question):
+        summaries = _search_summaries(query_vector, primary, timer, deadline)
+        if summaries:
+            logger.info(f"Answering broad question from {len(summaries)} summaries")
+            return summaries
+    if fallback:
+        logger.info(f"Routing query to years: {', '.join(next(iter(primary.values())))}")
+    results = _search_collections(query_vector, primary, limit_per_collection, timer, deadline)
+    if not results and fallback:
+        # Nothing relevant in the named years - fall back to the remaining collections
+        results = _search_collections(query_vector, fallback, limit_per_collection, timer, deadline)
+    
+    with timed(timer, "dedupe_rerank"):
+        results = _dedupe_results(results)  # Top 5 unique results
+    
+    with timed(timer, "parent_expansion"):
+        results = expand_to_parents(_qdrant, results)
+    
+    # KPI questions also get the exact rows from the structured table index
+    table_rows = _table_context(question, {language: list(route) for language, route in primary.items()}, timer)
+    return results + table_rows
+
+def _pack_group(chunks: List[Dict], budget: int) -> List[Dict]:
+    """Exact table rows first (they have no similarity score), then the best passages in the remaining budget"""
+    tables = pack_context([c for c in chunks if c.get('level') == TABLE_LEVEL], budget)
+    used = sum(chunk['token_count'] for chunk in tables)
+    return tables + pack_context([c for c in chunks if c.get('level') != TABLE_LEVEL], budget - used)
+
+def _sources(context_chunks: List[Dict]) -> List[Dict]:
+    """Source list for responses: scored passages, then table rows (score None)"""
+    passages = [{'year': chunk['year'], 'score': chunk['score']}
+                for chunk in context_chunks if chunk.get('level') != TABLE_LEVEL]
+    tables = [{'year': chunk['year'], 'score': None, 'level': TABLE_LEVEL}
+              for chunk in context_chunks if chunk.get('level') == TABLE_LEVEL]
+    return passages + tables
+
+def _confidence(context_chunks: List[Dict]) -> float:
+    """Best similarity score among vector-retrieved chunks (table rows are exact matches, not scored)"""
+    return max((chunk['score'] for chunk in context_chunks if chunk.get('level') != TABLE_LEVEL), default=0.0)
+
+def _build_context(question: str, context_chunks: List[Dict], is_arabic: bool, chat_history: List[Dict] = None,
+                   timer: Optional[StageTimer] = None, query_vector=None) -> str:
+    """Compress and pack retrieved chunks into the prompt context (query_vector: the retrieval embedding, reused)"""
+    # Comparisons get one context section per year, each with an equal share of the budget
+    years = sorted({chunk['year'] for chunk in context_chunks})
+    if len(years) > 1 and _plan_comparison(question, is_arabic):
+        groups = {year: [chunk for chunk in context_chunks if chunk['year'] == year] for year in years}
+    else:
+        groups = {None: context_chunks}
+    
+    # Keep only question-relevant sentences before packing (summaries are already compact)
+    is_summary_context = all(chunk.get('level') for chunk in context_chunks)
+    if COMPRESSION_ENABLED and not is_summary_context:
+        with timed(timer, "context_compression"):
+            top_sentences = max(COMPRESSION_TOP_SENTENCES // len(groups), 4)
+            # Table rows are already exact and compact - keep them whole
+            groups = {
+                year: compress_context(question, [c for c in chunks if c.get('level') != TABLE_LEVEL],
+                                       query_vector=query_vector, top_sentences=top_sentences)
+                      + [c for c in chunks if c.get('level') == TABLE_LEVEL]
+                for year, chunks in groups.items()
+            }
+    
+    # Pack the best chunks into the token budget, leaving room for recent history
+    with timed(timer, "context_packing"):
+        history_tokens = history_token_count(chat_history or [])
+        budget = context_budget(history_tokens) // len(groups)
+        sections = []
+        for year, chunks in groups.items():
+            packed_text = "\n\n".join(chunk['text'] for chunk in _pack_group(chunks, budget))
+            if year is None:
+                sections.append(packed_text)
+            elif is_arabic:
+                sections.append(f"=== التقرير السنوي {year} ===\n{packed_text}")
+            else:
+                sections.append(f"=== Annual Report {year} ===\n{packed_text}")
+        return "\n\n".join(sections)
+
+def _context_fallback(combined_context: str, is_arabic: bool, timer: Optional[StageTimer] = None) -> str:
+    """Simple context-based answer when the LLM cannot be used"""
+    with timed(timer, "fallback"):
         if is_arabic:
-            return "عذراً، لم أجد معلومات محددة حول هذا السؤال في تقارير صندوق الاستثمارات العامة السنوية."
+            intro = "بناءً على المعلومات المتاحة في تقارير صندوق الاستثمارات العامة:\n\n"
         else:
-            return "I couldn't find specific information about that in the PIF annual reports."
+            intro = "Based on the PIF annual reports:\n\n"
+        
+        formatted_context = combined_context.replace('\n\n', '\n').strip()
+        
+        if len(formatted_context) > 800:
+            return f"{intro}{formatted_context[:800]}..."
+        return f"{intro}{formatted_context}"
+
+def _no_context_answer(is_arabic: bool) -> str:
+    if is_arabic:
+        return "عذراً، لم أجد معلومات محددة حول هذا السؤال في تقارير صندوق الاستثمارات العامة السنوية."
+    return "I couldn't find specific information about that in the PIF annual reports."
+
+def _question_complexity(question: str, combined_context: str, is_arabic: bool) -> float:
+    """Complexity score that picks the answer model tier and output cap"""
+    # Only a real multi-year plan counts as comparative ("growth in 2023" is a single-year lookup)
+    is_multi_year = _plan_comparison(question, is_arabic) is not None
+    return score_complexity(question, combined_context, is_multi_year, is_broad_question(question))
+
+def generate_answer_from_context(question: str, context_chunks: List[Dict], is_arabic: bool, chat_history: List[Dict] = None,
+                                 timer: Optional[StageTimer] = None, deadline: Optional[Deadline] = None,
+                                 query_vector=None, session_id: Optional[str] = None) -> str:
+    """Generate a comprehensive answer using LLM proxy with chat history"""
+    if not context_chunks:
+        return _no_context_answer(is_arabic)
     
-    # Combine context chunks
-    combined_context = "\n\n".join([chunk['text'] for chunk in context_chunks])
+    # Summarize history once; context packing and the prompt share the result
+    chat_history = prepare_history(chat_history or [], session_id=session_id)
+    combined_context = _build_context(question, context_chunks, is_arabic, chat_history, timer, query_vector)
     
     # Get LLM proxy instance
     try:
         llm_proxy = get_llm_proxy()
         
         # Generate answer using LLM with context AND chat history
-        answer = llm_proxy.generate_answer(
+        # (shared path: identical concurrent requests from other sessions ride on one call)
+        generate = llm_proxy.generate_answer_shared if LLM_COALESCE_REQUESTS else llm_proxy.generate_answer
+        answer = generate(
             question=question,
             context=combined_context,
             is_arabic=is_arabic,
-            chat_history=chat_history or [],  # Pass chat history
+            chat_history=chat_history,  # Prepared history (summary + recent turns)
             max_tokens=500,
-            temperature=0.3
+            temperature=0.3,
+            timer=timer,
+            deadline=deadline,
+            complexity=_question_complexity(question, combined_context, is_arabic)
         )
         
         return answer
@@ -102,71 +440,261 @@ def generate_answer_from_context(question: str, context_chunks: List[Dict], is_a
         logger.error(f"Error generating answer with LLM: {e}")
         
         # Fallback to simple context-based answer
-        if is_arabic:
-            intro = "بناءً على المعلومات المتاحة في تقارير صندوق الاستثمارات العامة:\n\n"
-        else:
-            intro = "Based on the PIF annual reports:\n\n"
-        
-        formatted_context = combined_context.replace('\n\n', '\n').strip()
-        
-        if len(formatted_context) > 800:
-            answer = f"{intro}{formatted_context[:800]}..."
-        else:
-            answer = f"{intro}{formatted_context}"
-        
-        return answer
+        return _context_fallback(combined_context, is_arabic, timer)
 
-def get_rag_answer(question: str, chat_history: List[Dict] = None) -> str:
-    """Enhanced RAG function with chat history support"""
+def generate_answer_stream_from_context(question: str, context_chunks: List[Dict], is_arabic: bool,
+                                        chat_history: List[Dict] = None, timer: Optional[StageTimer] = None,
+                                        deadline: Optional[Deadline] = None, query_vector=None,
+                                        session_id: Optional[str] = None) -> Iterator[str]:
+    """Streaming variant of generate_answer_from_context: yields text pieces as they are generated"""
+    if not context_chunks:
+        yield _no_context_answer(is_arabic)
+        return
+    
+    chat_history = prepare_history(chat_history or [], session_id=session_id)
+    combined_context = _build_context(question, context_chunks, is_arabic, chat_history, timer, query_vector)
+    
+    try:
+        llm_proxy = get_llm_proxy()
+    except Exception as e:
+        logger.error(f"Error generating answer with LLM: {e}")
+        yield _context_fallback(combined_context, is_arabic, timer)
+        return
+    
+    yield from llm_proxy.generate_answer_stream(
+        question=question,
+        context=combined_context,
+        is_arabic=is_arabic,
+        chat_history=chat_history,
+        max_tokens=500,
+        temperature=0.3,
+        timer=timer,
+        deadline=deadline,
+        complexity=_question_complexity(question, combined_context, is_arabic)
+    )
+
+def _log_timings(timer: StageTimer):
+    """Log the per-stage breakdown of one RAG call"""
+    timings = timer.to_dict()
+    breakdown = ", ".join(f"{s['name']}={s['duration_ms']:.0f}ms" for s in timings['stages'])
+    logger.info(f"⏱️ RAG total {timings['total_ms']:.0f}ms ({breakdown})")
+
+def get_rag_answer(question: str, chat_history: List[Dict] = None, timeout: Optional[float] = None,
+                   deadline: Optional[Deadline] = None, session_id: Optional[str] = None) -> str:
+    """
+    Enhanced RAG function with chat history support, bounded by a request deadline
+    
+    A caller-owned deadline (instead of timeout) lets the caller cancel the work
+    between stages (see Deadline.cancel). session_id keys the conversation's
+    cached history summary.
+    """
+    timer = StageTimer()
+    deadline = deadline or Deadline(timeout or RAG_REQUEST_TIMEOUT)
     try:
         # Detect language
-        is_arabic_question = is_arabic(question)
+        with timed(timer, "language_detection"):
+            is_arabic_question = is_arabic(question)
+        
+        # Greetings, thanks and out-of-scope messages never reach retrieval or the LLM
+        intent, query_vector = _classify_question(question, timer, deadline)
+        if intent != INTENT_CORPUS:
+            logger.info(f"Fast path: {intent}")
+            return intent_reply(intent, is_arabic_question)
         
         # Search across multiple collections
-        context_chunks = search_multiple_collections(question, is_arabic_question)
+        # One query embedding serves both the search and context compression
+        if query_vector is None:
+            query_vector = _embed_question(question, timer, deadline)
+        context_chunks = search_multiple_collections(question, is_arabic_question, timer=timer, deadline=deadline,
+                                                     query_vector=query_vector)
         
         if not context_chunks:
-            if is_arabic_question:
-                return "عذراً، لم أجد معلومات محددة حول هذا السؤال في تقارير صندوق الاستثمارات العامة السنوية. يمكنك إعادة صياغة سؤالك أو السؤال عن جانب مختلف من استثمارات الصندوق."
-            else:
-                return "I'm sorry, I couldn't find specific information about that in the PIF annual reports. You can rephrase your question or ask about a different aspect of PIF's investments."
+            return NO_CONTEXT_ANSWER_AR if is_arabic_question else NO_CONTEXT_ANSWER_EN
         
         # Generate comprehensive answer WITH chat history
-        answer = generate_answer_from_context(question, context_chunks, is_arabic_question, chat_history)
+        answer = generate_answer_from_context(question, context_chunks, is_arabic_question, chat_history,
+                                              timer=timer, deadline=deadline, query_vector=query_vector,
+                                              session_id=session_id)
         
         return answer
         
+    except (RetrievalUnavailable, DeadlineExceeded) as e:
+        logger.warning(f"Degraded RAG response: {e}")
+        return DEGRADED_ANSWER_AR if is_arabic(question) else DEGRADED_ANSWER_EN
     except Exception as e:
         logger.error(f"Error in RAG processing: {e}")
-        if is_arabic(question):
-            return "عذراً، حدث خطأ في معالجة سؤالك. يرجى المحاولة مرة أخرى أو طرح سؤال مختلف."
-        else:
-            return "I'm sorry, there was an error processing your question. Please try again or ask a different question."
+        return ERROR_ANSWER_AR if is_arabic(question) else ERROR_ANSWER_EN
+    finally:
+        _log_timings(timer)
 
-def get_rag_answer_with_sources(question: str, chat_history: List[Dict] = None) -> Dict:
-    """Get RAG answer with source information and chat history"""
+def get_rag_answer_stream(question: str, chat_history: List[Dict] = None, timeout: Optional[float] = None,
+                          session_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Streaming variant of get_rag_answer: yields the answer as the LLM generates it
+    
+    Retrieval completes before the first piece, so time-to-first-token is the
+    latency the user sees. Fast-path, no-context and degraded replies are
+    yielded as a single piece.
+    """
+    timer = StageTimer()
+    deadline = Deadline(timeout or RAG_REQUEST_TIMEOUT)
     try:
-        is_arabic_question = is_arabic(question)
-        context_chunks = search_multiple_collections(question, is_arabic_question)
+        with timed(timer, "language_detection"):
+            is_arabic_question = is_arabic(question)
+        
+        intent, query_vector = _classify_question(question, timer, deadline)
+        if intent != INTENT_CORPUS:
+            logger.info(f"Fast path: {intent}")
+            yield intent_reply(intent, is_arabic_question)
+            return
+        
+        # One query embedding serves both the search and context compression
+        if query_vector is None:
+            query_vector = _embed_question(question, timer, deadline)
+        context_chunks = search_multiple_collections(question, is_arabic_question, timer=timer, deadline=deadline,
+                                                     query_vector=query_vector)
+        if not context_chunks:
+            yield NO_CONTEXT_ANSWER_AR if is_arabic_question else NO_CONTEXT_ANSWER_EN
+            return
+        
+        yield from generate_answer_stream_from_context(question, context_chunks, is_arabic_question, chat_history,
+                                                       timer=timer, deadline=deadline, query_vector=query_vector,
+                                                       session_id=session_id)
+    
+    except (RetrievalUnavailable, DeadlineExceeded) as e:
+        logger.warning(f"Degraded RAG response: {e}")
+        yield DEGRADED_ANSWER_AR if is_arabic(question) else DEGRADED_ANSWER_EN
+    except Exception as e:
+        logger.error(f"Error in RAG processing: {e}")
+        yield ERROR_ANSWER_AR if is_arabic(question) else ERROR_ANSWER_EN
+    finally:
+        _log_timings(timer)
+
+def get_rag_answer_with_sources(question: str, chat_history: List[Dict] = None, timeout: Optional[float] = None,
+                                session_id: Optional[str] = None) -> Dict:
+    """Get RAG answer with source information, chat history and per-stage timings"""
+    timer = StageTimer()
+    deadline = Deadline(timeout or RAG_REQUEST_TIMEOUT)
+    try:
+        with timed(timer, "language_detection"):
+            is_arabic_question = is_arabic(question)
+        
+        intent, query_vector = _classify_question(question, timer, deadline)
+        if intent != INTENT_CORPUS:
+            return {
+                'answer': intent_reply(intent, is_arabic_question),
+                'sources': [],
+                'confidence': 0.0,
+                'intent': intent,
+                'timings': timer.to_dict()
+            }
+        
+        # One query embedding serves both the search and context compression
+        if query_vector is None:
+            query_vector = _embed_question(question, timer, deadline)
+        context_chunks = search_multiple_collections(question, is_arabic_question, timer=timer, deadline=deadline,
+                                                     query_vector=query_vector)
         
         if not context_chunks:
             return {
                 'answer': "No relevant information found",
                 'sources': [],
-                'confidence': 0.0
+                'confidence': 0.0,
+                'timings': timer.to_dict()
             }
         
-        answer = generate_answer_from_context(question, context_chunks, is_arabic_question, chat_history)
+        answer = generate_answer_from_context(question, context_chunks, is_arabic_question, chat_history,
+                                              timer=timer, deadline=deadline, query_vector=query_vector,
+                                              session_id=session_id)
         
         return {
             'answer': answer,
-            'sources': [{'year': chunk['year'], 'score': chunk['score']} for chunk in context_chunks],
-            'confidence': context_chunks[0]['score'] if context_chunks else 0.0
+            'sources': _sources(context_chunks),
+            'confidence': _confidence(context_chunks),
+            'timings': timer.to_dict()
         }
         
+    except (RetrievalUnavailable, DeadlineExceeded) as e:
+        logger.warning(f"Degraded RAG response: {e}")
+        return {
+            'answer': DEGRADED_ANSWER_AR if is_arabic(question) else DEGRADED_ANSWER_EN,
+            'sources': [],
+            'confidence': 0.0,
+            'degraded': True,
+            'timings': timer.to_dict()
+        }
     except Exception as e:
         return {
             'answer': f"Error: {str(e)}",
             'sources': [],
-            'confidence': 0.0
-        }
\ No newline at end of file
+            'confidence': 0.0,
+            'timings': timer.to_dict()
+        }
+
+def get_rag_answers_batch(questions: List[str], max_concurrency: int = BATCH_MAX_CONCURRENCY,
+                          limit_per_collection: int = 3) -> List[Dict]:
+    """
+    Answer many questions efficiently (offline evaluation, cache pre-warming)
+    
+    Questions are embedded in batched calls; each then goes through the same
+    retrieval as get_rag_answer (search_multiple_collections: routing,
+    comparison plan, summary tier, table rows, bilingual search). LLM calls
+    run with bounded concurrency and are held to each model's rpm/tpm by the
+    LLM proxy's rate limiter (see LLMProxyManager).
+    
+    Returns:
+        list of dicts in input order with 'question', 'answer', 'sources',
+        'confidence' and 'error' (None on success)
+    """
+    if not questions:
+        return []
+    
+    arabic_flags = [is_arabic(q) for q in questions]
+    query_vectors = embed_queries(questions)
+    
+    def answer_one(i: int) -> Dict:
+        question = questions[i]
+        intent = match_intent_rules(question) if INTENT_FAST_PATH else None
+        if intent not in (None, INTENT_CORPUS):
+            return {
+                'question': question,
+                'answer': intent_reply(intent, arabic_flags[i]),
+                'sources': [],
+                'confidence': 0.0,
+                'error': None
+            }
+        query_vector = query_vectors[i:i + 1]
+        if not query_vector.any():
+            raise RetrievalUnavailable("Query embedding failed")
+        
+        context_chunks = search_multiple_collections(question, arabic_flags[i], limit_per_collection,
+                                                     query_vector=query_vector)
+        answer = generate_answer_from_context(question, context_chunks, arabic_flags[i],
+                                              query_vector=query_vector)
+        
+        return {
+            'question': question,
+            'answer': answer,
+            'sources': _sources(context_chunks),
+            'confidence': _confidence(context_chunks),
+            'error': None
+        }
+    
+    results: List[Optional[Dict]] = [None] * len(questions)
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+        futures = {pool.submit(answer_one, i): i for i in range(len(questions))}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                logger.error(f"Batch item {i} failed: {e}")
+                results[i] = {
+                    'question': questions[i],
+                    'answer': None,
+                    'sources': [],
+                    'confidence': 0.0,
+                    'error': str(e)
+                }
+    
+    return results
@@ -0,0 +1,93 @@
+"""
+KPI lookups against the structured table index
+Questions about headline figures (AUM, jobs, revenue, ...) get the exact table
+rows as compact context instead of relying on table text inside chunks
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List
+import logging
+
+from src.core.config import TABLE_CONTEXT_ROWS
+from src.core.normalization import normalize_text
+from src.core.table_index import format_value, query_table_rows
+
+logger = logging.getLogger(__name__)
+
+# KPI -> phrases that identify it in questions and in table labels (English and Arabic)
+KPI_TERMS = {
+    'aum': ['assets under management', 'aum', 'الأصول المدارة', 'أصول تحت الإدارة'],
+    'total_assets': ['total assets', 'إجمالي الأصول'],
+    'jobs': ['jobs', 'employment', 'employees', 'وظائف', 'فرص عمل', 'فرص العمل'],
+    'revenue': ['revenue', 'revenues', 'إيرادات'],
+    'net_income': ['net income', 'net profit', 'صافي الدخل', 'صافي الربح'],
+    'shareholder_return': ['total shareholder return', 'tsr', 'إجمالي عائد المساهمين'],
+}
+
+_KPI_KEYS = {kpi: [normalize_text(term) for term in terms] for kpi, terms in KPI_TERMS.items()}
+
+# Marks table chunks so compression keeps their rows intact
+TABLE_LEVEL = 'table'
+
+
+def detect_kpis(question: str) -> List[str]:
+    """KPIs a question asks about (empty for non-KPI questions)"""
+    text = normalize_text(question)
+    return [kpi for kpi, terms in _KPI_KEYS.items() if any(term in text for term in terms)]
+
+
+def _normalized_figures(cells: List[Dict]) -> str:
+    """' [column = value, ...]' with values from the index's normalized columns ('' without cells)"""
+    figures = [
+        (f"{cell['column']} = " if not cell['column'].startswith('Unnamed') else "")
+        + format_value(cell['value'], cell['unit'])
+        for cell in cells
+    ]
+    return f" [{'; '.join(figures)}]" if figures else ""
+
+
+def lookup_table_rows(question: str, years: Iterable[str], language: str,
+                      limit: int = TABLE_CONTEXT_ROWS) -> List[Dict]:
+    """
+    Exact table rows for a KPI question, as one context chunk per report
+
+    Each row is followed by its figures normalized to one scale and unit, so
+    reports that state values in millions and in billions read the same.
+
+    Returns chunk dicts ('text', 'year', 'source', 'level'), or an empty list when
+    the question is not about a known KPI or the table index has no matching rows.
+    Table chunks carry no similarity score; they are packed ahead of the ranked
+    search results instead.
+    """
+    kpis = detect_kpis(question)
+    if not kpis:
+        return []
+
+    terms = [term for kpi in kpis for term in KPI_TERMS[kpi]]
+    try:
+        rows = query_table_rows(terms, years=years, language=language, limit=limit)
+    except Exception as e:
+        logger.warning(f"Table index lookup failed: {e}")
+        return []
+
+    by_report = defaultdict(list)
+    for row in rows:
+        by_report[(row['doc'], row['year'])].append(row)
+
+    chunks = []
+    for (doc, year), report_rows in by_report.items():
+        lines = [
+            f"Table {row['table_no']}" + (f" (page {row['page']})" if row['page'] else "")
+            + f": {row['row_text']}" + _normalized_figures(row['cells'])
+            for row in report_rows
+        ]
+        chunks.append({
+            'text': f"Report tables ({year}):\n" + "\n".join(lines),
+            'year': year,
+            'source': doc,
+            'level': TABLE_LEVEL
+        })
+
+    if chunks:
+        logger.info(f"📊 Table index: {len(rows)} rows for {', '.join(kpis)}")
+    return chunks
@@ -16,7 +16,9 @@ from .utils import (
     validate_question_input,
     generate_follow_up_questions,
     handle_user_input,
-    stream_text_output
+    stream_text_output,
+    stream_answer,
+    format_timings_waterfall
 )
 
 __all__ = [
@@ -32,4 +34,6 @@ __all__ = [
     'generate_follow_up_questions',
     'handle_user_input',
     'stream_text_output',
+    'stream_answer',
+    'format_timings_waterfall',
 ]
@@ -4,6 +4,7 @@ All reusable UI components in one place
 """
 
 import streamlit as st
+from src.llm.llm_proxy import get_llm_proxy
 
 # PIF Logo URL
 PIF_LOGO_URL = "https://cdn.brandfetch.io/idnYHC3i7K/theme/dark/logo.svg?c=1bxid64Mup7aczewSAYMX&t=1754092788470"
@@ -47,13 +48,11 @@ def render_sidebar():
                 if st.button("🔄 Restart", use_container_width=True, key="sidebar_restart"):
                     st.session_state.messages = []
                     st.session_state.user_name = None
-                    st.session_state.last_streamed_idx = -1
                     st.rerun()
             
             if st.button("🗑️ Clear All", use_container_width=True, type="secondary", key="sidebar_clear"):
                 st.session_state.messages = []
                 st.session_state.user_name = None
-                st.session_state.last_streamed_idx = -1
                 st.session_state.show_chat = False
                 st.rerun()
             
@@ -127,6 +126,16 @@ def render_sidebar():
         if st.session_state.user_name:
             st.success(f"👤 {st.session_state.user_name}")
         
+        # LLM backend status (debug only): health, circuit, process uptime/restarts, prompt caching
+        if st.session_state.debug_mode:
+            stats = get_llm_proxy().proxy_stats()
+            status = f"🛰️ LLM {stats['backend']}: {'🟢 healthy' if stats['healthy'] else '🔴 down'} • circuit {stats['circuit']}"
+            if 'restarts' in stats:
+                status += f" • up {stats['uptime'] / 60:.0f} min • {stats['restarts']} restarts"
+            cache = stats['prompt_cache']
+            status += f" • prefix reuse {cache['prefix_reuse']:.0%} • cached tokens {cache['cached_ratio']:.0%}"
+            st.caption(status)
+        
         st.markdown("---")
         
         # Tips Section
@@ -273,7 +282,6 @@ def render_control_panel():
     with col1:
         if st.button("↻", key="ctrl_restart", help="New Conversation", use_container_width=True):
             st.session_state.messages = []
-            st.session_state.last_streamed_idx = -1
             st.toast("✅ Started new conversation!", icon="🔄")  # Use valid emoji
             st.rerun()
     
@@ -302,7 +310,6 @@ def render_control_panel():
         if st.button("⨯", key="ctrl_logout", help="Logout & Exit", use_container_width=True):
             st.session_state.messages = []
             st.session_state.user_name = None
-            st.session_state.last_streamed_idx = -1
             st.session_state.show_chat = False
             st.toast("👋 Logged out successfully!", icon="✖️")  # Use valid emoji
             st.rerun()
@@ -361,19 +368,8 @@ def render_chat_messages():
     
     for idx, msg in enumerate(st.session_state.messages):
         with st.chat_message(msg["role"], avatar="🇸🇦" if msg["role"] == "assistant" else "👤"):
-            should_stream = (
-                msg["role"] == "assistant" and 
-                idx == len(st.session_state.messages) - 1 and 
-                idx > st.session_state.last_streamed_idx
-            )
-            
-            if should_stream:
-                from .utils import stream_text_output
-                placeholder = st.empty()
-                stream_text_output(placeholder, msg["content"])
-                st.session_state.last_streamed_idx = idx
-            else:
-                st.markdown(msg["content"])
+            # Answers are streamed live by handle_user_input; stored messages render as is
+            st.markdown(msg["content"])
             
             # Copy button for assistant messages
             if msg["role"] == "assistant":
@@ -387,14 +383,18 @@ def render_chat_messages():
                 for i, follow_up in enumerate(msg['follow_ups']):
                     with cols[i]:
                         if st.button(follow_up, key=f"followup_{idx}_{i}", use_container_width=True):
-                            from .utils import handle_user_input
-                            handle_user_input(follow_up)
+                            # Answered below the chat (not inside this column) on the next run
+                            st.session_state.queued_question = follow_up
+                            st.rerun()
 
 def render_chat_input():
     """Render chat input field"""
     
     placeholder = "What's your name?" if not st.session_state.user_name else "Ask about PIF investments..."
     
-    if prompt := st.chat_input(placeholder):
+    prompt = st.chat_input(placeholder)
+    # Typed input is answered first; a clicked follow-up stays queued for the rerun that follows
+    user_input = prompt or st.session_state.pop('queued_question', None)
+    if user_input:
         from .utils import handle_user_input
-        handle_user_input(prompt)
\ No newline at end of file
+        handle_user_input(user_input)
\ No newline at end of file
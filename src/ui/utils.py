@@ -4,9 +4,10 @@ All business logic and helper functions
 """
 
 import streamlit as st
-import time
 import re
-from src.retrieval.rag_query import get_rag_answer, get_rag_answer_with_sources
+from itertools import chain
+from src.retrieval.rag_query import get_rag_answer_stream, get_rag_answer_with_sources
+from src.core.normalization import normalize_text
 
 def extract_name_from_input(user_input):
     """Extract name from user input"""
@@ -40,24 +41,25 @@ def generate_follow_up_questions(question, answer):
     follow_ups = []
     arabic_pattern = re.compile(r'[\u0600-\u06FF]')
     is_arabic = bool(arabic_pattern.search(question))
+    normalized = normalize_text(question)  # Matches spelling variants, diacritics and Arabic digits
     
     if is_arabic:
-        if 'استثمار' in question or 'قطاع' in question:
+        if 'استثمار' in normalized or 'قطاع' in normalized:
             follow_ups.append('ما هي القطاعات الاستثمارية الأخرى؟')
             follow_ups.append('كم قيمة الاستثمارات الإجمالية؟')
-        elif 'وظيفة' in question or 'وظائف' in question:
+        elif normalize_text('وظيفة') in normalized or 'وظائف' in normalized:
             follow_ups.append('ما هي مبادرات التوظيف الأخرى؟')
-        elif 'نيوم' in question or 'NEOM' in question:
+        elif 'نيوم' in normalized or 'neom' in normalized:
             follow_ups.append('ما هي مشاريع رؤية 2030 الأخرى؟')
     else:
-        if 'investment' in question.lower() or 'sector' in question.lower():
+        if 'investment' in normalized or 'sector' in normalized:
             follow_ups.append('What other sectors does PIF invest in?')
             follow_ups.append('What is the total value of investments?')
-        elif 'job' in question.lower():
+        elif 'job' in normalized:
             follow_ups.append('What are other job creation initiatives?')
-        elif 'neom' in question.lower():
+        elif 'neom' in normalized:
             follow_ups.append('What other Vision 2030 projects exist?')
-        elif '2023' in question:
+        elif '2023' in normalized:
             follow_ups.append('How does this compare to 2022?')
     
     if not follow_ups:
@@ -68,15 +70,45 @@ def generate_follow_up_questions(question, answer):
     
     return follow_ups[:2]
 
-def stream_text_output(placeholder, text):
-    """Stream text word by word"""
-    words = text.split()
+def format_timings_waterfall(timings, width=30):
+    """Render per-stage timings as a text waterfall (one bar per stage, offset by start time)"""
+    stages = timings.get('stages', []) if timings else []
+    total_ms = timings.get('total_ms', 0.0) if timings else 0.0
+    if not stages or total_ms <= 0:
+        return ""
+    
+    scale = width / total_ms
+    name_width = max(len(s['name']) for s in stages)
+    rows = []
+    for s in stages:
+        offset = min(int(s['start_ms'] * scale), width - 1)
+        length = max(1, min(round(s['duration_ms'] * scale), width - offset))
+        bar = " " * offset + "█" * length + " " * (width - offset - length)
+        rows.append(f"{s['name']:<{name_width}} |{bar}| {s['duration_ms']:8.1f} ms")
+    rows.append(f"{'total':<{name_width}} |{'─' * width}| {total_ms:8.1f} ms")
+    return "```\n" + "\n".join(rows) + "\n```"
+
+def stream_text_output(placeholder, chunks):
+    """Render text pieces as they arrive (e.g. LLM tokens) and return the full text"""
     displayed_text = ""
-    for word in words:
-        displayed_text += word + " "
+    for chunk in chunks:
+        displayed_text += chunk
         placeholder.markdown(displayed_text + "▌")
-        time.sleep(0.03)
-    placeholder.markdown(displayed_text.strip())
+    placeholder.markdown(displayed_text)
+    return displayed_text
+
+def stream_answer(question, chat_history, prefetched=None):
+    """Render the answer in a new assistant message as the LLM generates it"""
+    with st.chat_message("assistant", avatar="🇸🇦"):
+        placeholder = st.empty()
+        if prefetched:
+            return stream_text_output(placeholder, [prefetched])
+        
+        chunks = get_rag_answer_stream(question, chat_history=chat_history,
+                                       session_id=st.session_state.session_id)
+        with st.spinner('🔍 Searching PIF documents...'):
+            first = next(chunks, "")  # Retrieval runs until the first token arrives
+        return stream_text_output(placeholder, chain([first], chunks))
 
 def handle_user_input(user_input):
     """Process user input and update chat"""
@@ -95,34 +127,60 @@ def handle_user_input(user_input):
         return
     
     st.session_state.messages.append({'role': 'user', 'content': user_input})
+    with st.chat_message('user', avatar="👤"):
+        st.markdown(user_input)
     
-    with st.spinner('🔍 Searching PIF documents...'):
-        try:
-            # Prepare chat history (exclude welcome message and current question)
-            chat_history = [msg for msg in st.session_state.messages[:-1] 
-                          if msg.get('content') and not msg['content'].startswith('🎉')]
-            
-            if st.session_state.debug_mode:
-                rag_result = get_rag_answer_with_sources(user_input, chat_history=chat_history)
-                answer = rag_result['answer']
-                
-                if rag_result['sources']:
-                    debug_info = f"\n\n**🔍 Debug Info:**\n"
-                    debug_info += f"• Sources: {len(rag_result['sources'])}\n"
-                    debug_info += f"• Confidence: {rag_result['confidence']:.2f}\n"
-                    sources_str = ', '.join([f"{s['year']} ({s['score']:.2f})" for s in rag_result['sources']])
-                    debug_info += f"• Years: {sources_str}\n"
-                    debug_info += f"• History: {len(chat_history)} messages"
-                    answer += debug_info
-            else:
-                answer = get_rag_answer(user_input, chat_history=chat_history)
+    prefetcher = st.session_state.prefetcher
+    
+    try:
+        # Prepare chat history (exclude welcome message and current question)
+        chat_history = [msg for msg in st.session_state.messages[:-1] 
+                      if msg.get('content') and not msg['content'].startswith('🎉')]
+        
+        # Clicked follow-ups may already be answered in the background; anything else is stale now
+        prefetched = None
+        if not st.session_state.debug_mode:
+            with st.spinner('💭 Checking for a prepared answer...'):
+                prefetched = prefetcher.get(user_input, chat_history)
+        prefetcher.cancel_all()
+        
+        if st.session_state.debug_mode:
+            with st.spinner('🔍 Searching PIF documents...'):
+                rag_result = get_rag_answer_with_sources(user_input, chat_history=chat_history,
+                                                         session_id=st.session_state.session_id)
+            answer = rag_result['answer']
             
-            if not answer or answer.strip() == "":
-                answer = "I couldn't find specific information. Please rephrase your question."
+            if rag_result['sources']:
+                debug_info = f"\n\n**🔍 Debug Info:**\n"
+                debug_info += f"• Sources: {len(rag_result['sources'])}\n"
+                debug_info += f"• Confidence: {rag_result['confidence']:.2f}\n"
+                sources_str = ', '.join([
+                    f"{s['year']} ({s['score']:.2f})" if s['score'] is not None else f"{s['year']} (table)"
+                    for s in rag_result['sources']
+                ])
+                debug_info += f"• Years: {sources_str}\n"
+                debug_info += f"• History: {len(chat_history)} messages"
+                answer += debug_info
             
-            follow_ups = generate_follow_up_questions(user_input, answer)
-            st.session_state.messages.append({'role': 'assistant', 'content': answer, 'follow_ups': follow_ups[:2]})
-        except Exception as e:
-            st.session_state.messages.append({'role': 'assistant', 'content': f"Error: {str(e)[:100]}", 'follow_ups': []})
+            waterfall = format_timings_waterfall(rag_result.get('timings'))
+            if waterfall:
+                answer += f"\n\n**⏱️ Timings:**\n{waterfall}"
+        else:
+            # Real tokens are rendered as they arrive
+            answer = stream_answer(user_input, chat_history, prefetched)
+        
+        if not answer or answer.strip() == "":
+            answer = "I couldn't find specific information. Please rephrase your question."
+        
+        follow_ups = generate_follow_up_questions(user_input, answer)
+        st.session_state.messages.append({'role': 'assistant', 'content': answer, 'follow_ups': follow_ups[:2]})
+        
+        # Answer the suggested follow-ups speculatively (history as it will be when one is clicked)
+        if not st.session_state.debug_mode:
+            next_history = [msg for msg in st.session_state.messages
+                            if msg.get('content') and not msg['content'].startswith('🎉')]
+            prefetcher.prefetch(follow_ups[:2], next_history)
+    except Exception as e:
+        st.session_state.messages.append({'role': 'assistant', 'content': f"Error: {str(e)[:100]}", 'follow_ups': []})
     
     st.rerun()
\ No newline at end of file
@@ -0,0 +1,66 @@
+"""Tests for the LLM proxy circuit breaker and its interaction with the rate limiter"""
+
+import pytest
+
+from src.llm import llm_proxy
+from src.llm.health_monitor import CircuitBreaker
+from src.llm.mock_server import mock_llm_proxy
+from src.llm.rate_limiter import ModelLimits
+
+
+def _answer(manager):
+    return manager.generate_answer("What is PIF's AUM?", "PIF AUM is SAR 2.87 trillion.")
+
+
+def _answer_stream(manager):
+    return "".join(manager.generate_answer_stream("What is PIF's AUM?", "PIF AUM is SAR 2.87 trillion."))
+
+
+def _open_breaker(manager):
+    manager.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    manager.breaker.record_failure()
+    assert manager.breaker.state == CircuitBreaker.OPEN
+
+
+def _set_buckets(manager, full: bool):
+    for limits in manager.rate_limiter.models.values():
+        limits.requests.level = limits.requests.capacity if full else 0.0
+
+
+def test_half_open_allows_a_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()
+
+
+def test_released_probe_can_be_claimed_again():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow_request()
+
+    breaker.release_probe()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow_request()
+
+
+@pytest.mark.parametrize("call", [_answer, _answer_stream])
+def test_rate_limited_probe_does_not_wedge_the_breaker(call):
+    with mock_llm_proxy() as server:
+        manager = llm_proxy.get_llm_proxy()
+        manager.rate_limiter.max_wait = 0  # Saturated -> RateLimitExceeded instead of waiting
+        manager.rate_limiter.models = {model: ModelLimits(model, rpm=60) for model in manager.model_chain}
+        _open_breaker(manager)
+
+        _set_buckets(manager, full=False)
+        call(manager)
+        assert sum(server.stats.requests.values()) == 0
+        assert manager.breaker.state == CircuitBreaker.OPEN
+
+        _set_buckets(manager, full=True)
+        call(manager)
+        assert sum(server.stats.requests.values()) == 1
+        assert manager.breaker.state == CircuitBreaker.CLOSED
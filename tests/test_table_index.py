@@ -0,0 +1,27 @@
+"""Tests for table value parsing and formatting"""
+
+import pytest
+
+from src.core.table_index import format_value, parse_number
+
+
+@pytest.mark.parametrize("value, unit, expected", [
+    (120.5e9, 'SAR', "SAR 120.5 billion"),
+    (999.9e9, 'SAR', "SAR 999.9 billion"),
+    (2.87e12, 'SAR', "SAR 2.87 trillion"),
+    (1_234.5e6, 'USD', "USD 1.23 billion"),
+    (64e6, None, "64 million"),
+    (1_000, None, "1,000"),
+    (1_234.5, None, "1,234.5"),
+    (12.5, 'percent', "12.5%"),
+])
+def test_format_value(value, unit, expected):
+    assert format_value(value, unit) == expected
+
+
+def test_format_value_keeps_exact_figures_from_cells():
+    value, unit = parse_number("120.5", "Total assets (SAR bn)")
+    assert format_value(value, unit) == "SAR 120.5 billion"
+
+    value, unit = parse_number("999.9", "AUM (SAR bn)")
+    assert format_value(value, unit) == "SAR 999.9 billion"